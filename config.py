@@ -1,29 +1,156 @@
 import os
-from dotenv import load_dotenv
+import sys
+from dataclasses import dataclass
+from functools import cache, lru_cache
+from pathlib import Path
 
-# Load environment variables from .env file
-load_dotenv()
+@cache
+def _ensure_dotenv() -> None:
+    """Load .env exactly once, even across reimports/reloads.
 
+    In containerized deploys the orchestrator injects env vars and no .env
+    exists, so both the file read and the python-dotenv import itself are
+    skipped entirely. The environment flag guards against a second parse
+    when the module is re-executed (pytest, importlib.reload, forked
+    workers), where the functools.cache alone would be reset.
+    """
+    if os.environ.get("_DOTENV_LOADED"):
+        return
+    env_file = Path(os.getenv("DOTENV_PATH", ".env"))
+    if env_file.is_file():
+        from dotenv import load_dotenv
+        load_dotenv(env_file, override=False, verbose=False)
+    os.environ["_DOTENV_LOADED"] = "1"
+
+@dataclass(slots=True, frozen=True)
 class Settings:
-    """Application settings loaded from environment variables."""
-    IMAGE_UPLOAD_URL: str = os.getenv("IMAGE_UPLOAD_URL")
-    SECRET_KEY: str = os.getenv("SECRET_KEY")
-    REDIS_URL: str = os.getenv("REDIS_URL")
-    METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9090"))
-    MEDIUM_API_KEY: str = os.getenv("MEDIUM_API_KEY")
-    # Default to the potentially incorrect URL for now, will be updated in publishers/medium_publisher.py
-    MEDIUM_API_URL: str = os.getenv("MEDIUM_API_URL", "https://api.medium.com/v1/users/me/publications")
-    SUBSTACK_API_KEY: str = os.getenv("SUBSTACK_API_KEY")
-    SUBSTACK_USERNAME: str = os.getenv("SUBSTACK_USERNAME") # Added for Playwright automation
-    SUBSTACK_PASSWORD: str = os.getenv("SUBSTACK_PASSWORD") # Added for Playwright automation
-    PLAYWRIGHT_BROWSER: str = os.getenv("PLAYWRIGHT_BROWSER", "chromium") # Added for Playwright automation
-    PLAYWRIGHT_HEADLESS: bool = os.getenv("PLAYWRIGHT_HEADLESS", "true").lower() == "true" # Added for Playwright automation
-    DEFAULT_LANGUAGE: str = os.getenv("DEFAULT_LANGUAGE", "en")
-    SUPPORTED_LANGUAGES: list[str] = os.getenv("SUPPORTED_LANGUAGES", "en").split(",")
-    MIN_CONTENT_LENGTH: int = int(os.getenv("MIN_CONTENT_LENGTH", "50"))
-    MAX_TITLE_LENGTH: int = int(os.getenv("MAX_TITLE_LENGTH", "100"))
-    MAX_SUBTITLE_LENGTH: int = int(os.getenv("MAX_SUBTITLE_LENGTH", "200"))
-    MAX_TAGS: int = int(os.getenv("MAX_TAGS", "5"))
-
-# Create a settings instance
-settings = Settings()
\ No newline at end of file
+    """Application settings parsed once from environment variables.
+
+    slots=True drops the per-instance __dict__ so the hot module-global
+    attribute reads are C-level slot lookups; frozen=True keeps the
+    singleton safely shareable.
+    """
+    IMAGE_UPLOAD_URL: str
+    SECRET_KEY: str
+    REDIS_URL: str
+    METRICS_PORT: int
+    MEDIUM_API_KEY: str
+    MEDIUM_API_URL: str
+    SUBSTACK_API_KEY: str
+    SUBSTACK_USERNAME: str
+    SUBSTACK_PASSWORD: str
+    TWITTER_API_KEY: str
+    TWITTER_API_SECRET: str
+    TWITTER_ACCESS_TOKEN: str
+    TWITTER_ACCESS_TOKEN_SECRET: str
+    BLUESKY_IDENTIFIER: str
+    BLUESKY_PASSWORD: str
+    REDDIT_CLIENT_ID: str
+    REDDIT_CLIENT_SECRET: str
+    REDDIT_USERNAME: str
+    REDDIT_PASSWORD: str
+    REDDIT_USER_AGENT: str
+    PLAYWRIGHT_BROWSER: str
+    PLAYWRIGHT_HEADLESS: bool
+    CDP_ENDPOINT: str
+    ENABLED_PLATFORMS: tuple[str, ...]
+    DEFAULT_LANGUAGE: str
+    SUPPORTED_LANGUAGES: tuple[str, ...]
+    MAX_CONCURRENT_IMAGE_IO: int
+    MAX_IMAGE_BYTES: int
+    ENHANCED_IMAGE_VALIDATION: bool
+    MIN_CONTENT_LENGTH: int
+    MAX_TITLE_LENGTH: int
+    MAX_SUBTITLE_LENGTH: int
+    MAX_TAGS: int
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Read os.environ once and build the frozen settings instance."""
+        env = os.environ.get
+        return cls(
+            IMAGE_UPLOAD_URL=env("IMAGE_UPLOAD_URL"),
+            SECRET_KEY=env("SECRET_KEY"),
+            REDIS_URL=env("REDIS_URL"),
+            METRICS_PORT=int(env("METRICS_PORT", "9090")),
+            MEDIUM_API_KEY=env("MEDIUM_API_KEY"),
+            # Default to the potentially incorrect URL for now, will be updated in publishers/medium_publisher.py
+            MEDIUM_API_URL=env("MEDIUM_API_URL", "https://api.medium.com/v1/users/me/publications"),
+            SUBSTACK_API_KEY=env("SUBSTACK_API_KEY"),
+            SUBSTACK_USERNAME=env("SUBSTACK_USERNAME"), # Added for Playwright automation
+            SUBSTACK_PASSWORD=env("SUBSTACK_PASSWORD"), # Added for Playwright automation
+            TWITTER_API_KEY=env("TWITTER_API_KEY"),
+            TWITTER_API_SECRET=env("TWITTER_API_SECRET"),
+            TWITTER_ACCESS_TOKEN=env("TWITTER_ACCESS_TOKEN"),
+            TWITTER_ACCESS_TOKEN_SECRET=env("TWITTER_ACCESS_TOKEN_SECRET"),
+            BLUESKY_IDENTIFIER=env("BLUESKY_IDENTIFIER"),
+            BLUESKY_PASSWORD=env("BLUESKY_PASSWORD"),
+            REDDIT_CLIENT_ID=env("REDDIT_CLIENT_ID"),
+            REDDIT_CLIENT_SECRET=env("REDDIT_CLIENT_SECRET"),
+            REDDIT_USERNAME=env("REDDIT_USERNAME"),
+            REDDIT_PASSWORD=env("REDDIT_PASSWORD"),
+            REDDIT_USER_AGENT=env("REDDIT_USER_AGENT", "mcp-publishflow"),
+            PLAYWRIGHT_BROWSER=env("PLAYWRIGHT_BROWSER", "chromium"), # Added for Playwright automation
+            PLAYWRIGHT_HEADLESS=env("PLAYWRIGHT_HEADLESS", "true").lower() == "true", # Added for Playwright automation
+            CDP_ENDPOINT=env("CDP_ENDPOINT"), # Optional remote browser endpoint for connect_over_cdp
+            # Platforms whose tools get registered; trim to the ones in use
+            ENABLED_PLATFORMS=tuple(
+                sys.intern(platform)
+                for platform in env("ENABLED_PLATFORMS", "medium,substack,twitter,bluesky,reddit").split(",")
+            ),
+            DEFAULT_LANGUAGE=sys.intern(env("DEFAULT_LANGUAGE", "en")),
+            # Frozen tuple of interned codes so downstream membership/equality
+            # checks are pointer compares.
+            SUPPORTED_LANGUAGES=tuple(sys.intern(lang) for lang in env("SUPPORTED_LANGUAGES", "en").split(",")),
+            # Ceiling on concurrent image downloads/uploads per post; keeps
+            # large batches below aiohttp's per-connector default of 100
+            MAX_CONCURRENT_IMAGE_IO=int(env("MAX_CONCURRENT_IMAGE_IO", "32")),
+            # Hard ceiling on a single downloaded image (bytes)
+            MAX_IMAGE_BYTES=int(env("MAX_IMAGE_BYTES", str(10 * 1024 * 1024))),
+            # Opt-in full Pillow verify; the default magic-byte sniff is
+            # enough to reject non-images cheaply
+            ENHANCED_IMAGE_VALIDATION=env("ENHANCED_IMAGE_VALIDATION", "false").lower() == "true",
+            MIN_CONTENT_LENGTH=int(env("MIN_CONTENT_LENGTH", "50")),
+            MAX_TITLE_LENGTH=int(env("MAX_TITLE_LENGTH", "100")),
+            MAX_SUBTITLE_LENGTH=int(env("MAX_SUBTITLE_LENGTH", "200")),
+            MAX_TAGS=int(env("MAX_TAGS", "5")),
+        )
+
+    def validate(self) -> None:
+        """Fail fast on missing required settings.
+
+        SECRET_KEY is always required; platform credentials are only
+        required for the platforms listed in ENABLED_PLATFORMS.
+
+        Raises:
+            ValueError: Listing every missing setting name.
+        """
+        missing = []
+        if not self.SECRET_KEY:
+            missing.append("SECRET_KEY")
+        for platform in self.ENABLED_PLATFORMS:
+            for name in _PLATFORM_CREDENTIALS.get(platform, ()):
+                if not getattr(self, name):
+                    missing.append(name)
+        if missing:
+            raise ValueError(f"Missing required settings: {', '.join(missing)}")
+
+# Credentials each platform's tools require; only enabled platforms are checked.
+_PLATFORM_CREDENTIALS = {
+    "medium": ("MEDIUM_API_KEY",),
+    "substack": ("SUBSTACK_USERNAME", "SUBSTACK_PASSWORD"),
+    "twitter": ("TWITTER_API_KEY", "TWITTER_API_SECRET",
+                "TWITTER_ACCESS_TOKEN", "TWITTER_ACCESS_TOKEN_SECRET"),
+    "bluesky": ("BLUESKY_IDENTIFIER", "BLUESKY_PASSWORD"),
+    "reddit": ("REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET",
+               "REDDIT_USERNAME", "REDDIT_PASSWORD"),
+}
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the memoized Settings singleton."""
+    _ensure_dotenv()
+    return Settings.from_env()
+
+# Keep a module-level instance for existing import sites
+settings = get_settings()
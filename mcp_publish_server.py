@@ -1,11 +1,15 @@
 import asyncio
+import inspect
 import platform
 import logging
+import aiohttp
+from functools import lru_cache
+from typing import Callable
 from mcp.server.fastmcp import FastMCP
 
-from config import config
+from config import get_settings
 from src.content_manager import ContentManager
-from src.security import SecurityManager
+from src.security import SecurityManager, get_shared_redis
 from src.monitoring import MonitoringManager
 from publishers.medium_publisher import MediumPublisher
 from publishers.substack_publisher import SubstackPublisher
@@ -26,6 +30,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Lazily parsed, memoized settings singleton
+config = get_settings()
+
 def initialize_managers():
     """Initialize all manager instances."""
     content_manager = ContentManager(
@@ -34,7 +41,7 @@ def initialize_managers():
     
     security_manager = SecurityManager(
         secret_key=config.SECRET_KEY,
-        redis_url=config.REDIS_URL
+        redis_client=get_shared_redis(config.REDIS_URL) if config.REDIS_URL else None
     )
     
     monitoring_manager = MonitoringManager(
@@ -43,46 +50,73 @@ def initialize_managers():
     
     return content_manager, security_manager, monitoring_manager
 
-def initialize_publishers():
-    """Initialize all publisher instances."""
-    medium_publisher = MediumPublisher(
+# Lazy publisher factories: each publisher is constructed (and performs any
+# auth calls) only when its tool is first invoked, then memoized. Deployments
+# that never use a platform pay nothing for it.
+@lru_cache(maxsize=None)
+def _medium() -> MediumPublisher:
+    return MediumPublisher(
         api_key=config.MEDIUM_API_KEY,
         api_url=config.MEDIUM_API_URL
     )
-    
-    substack_publisher = SubstackPublisher(content_manager=content_manager) # Added content_manager as per SubstackPublisher.__init__
-    
-    twitter_publisher = TwitterPublisher(
+
+@lru_cache(maxsize=None)
+def _substack(content_manager: ContentManager) -> SubstackPublisher:
+    return SubstackPublisher(content_manager=content_manager)
+
+@lru_cache(maxsize=None)
+def _twitter() -> TwitterPublisher:
+    return TwitterPublisher(
         api_key=config.TWITTER_API_KEY,
         api_secret=config.TWITTER_API_SECRET,
         access_token=config.TWITTER_ACCESS_TOKEN,
         access_token_secret=config.TWITTER_ACCESS_TOKEN_SECRET
     )
 
-    bluesky_publisher = BlueskyPublisher(
+@lru_cache(maxsize=None)
+def _bluesky() -> BlueskyPublisher:
+    return BlueskyPublisher(
         identifier=config.BLUESKY_IDENTIFIER,
         password=config.BLUESKY_PASSWORD
     )
 
-    reddit_publisher = RedditPublisher(
+@lru_cache(maxsize=None)
+def _reddit() -> RedditPublisher:
+    return RedditPublisher(
         client_id=config.REDDIT_CLIENT_ID,
         client_secret=config.REDDIT_CLIENT_SECRET,
         username=config.REDDIT_USERNAME,
         password=config.REDDIT_PASSWORD,
         user_agent=config.REDDIT_USER_AGENT
     )
-    
-    return medium_publisher, substack_publisher, twitter_publisher, bluesky_publisher, reddit_publisher
 
-def register_twitter_tools(
-    mcp: FastMCP,
-    content_manager: ContentManager,
-    monitoring_manager: MonitoringManager,
-    twitter_publisher: TwitterPublisher
-) -> None:
-    """Register Twitter tools with the MCP server."""
-    @mcp.tool(name="publish_tweet", description="Publishes a tweet to Twitter")
-    async def publish_tweet_tool(file_path: str, medium_link: str, substack_link: str):
+class PublishTools:
+    """Server-local publish tools as bound methods.
+
+    Dependencies live as instance attributes (LOAD_FAST self + attribute
+    lookup) instead of closure cells, and one instance owns the lifetime of
+    everything the tools capture.
+    """
+
+    def __init__(
+        self,
+        content_manager: ContentManager,
+        monitoring_manager: MonitoringManager,
+        medium_publisher_factory: Callable[[], MediumPublisher],
+        substack_publisher_factory: Callable[[], SubstackPublisher],
+        twitter_publisher_factory: Callable[[], TwitterPublisher],
+        bluesky_publisher_factory: Callable[[], BlueskyPublisher],
+        reddit_publisher_factory: Callable[[], RedditPublisher]
+    ):
+        self.content_manager = content_manager
+        self.monitoring_manager = monitoring_manager
+        self.medium_publisher_factory = medium_publisher_factory
+        self.substack_publisher_factory = substack_publisher_factory
+        self.twitter_publisher_factory = twitter_publisher_factory
+        self.bluesky_publisher_factory = bluesky_publisher_factory
+        self.reddit_publisher_factory = reddit_publisher_factory
+
+    async def publish_tweet_tool(self, file_path: str, medium_link: str, substack_link: str):
         """
         Publishes a tweet based on article content and provided links.
 
@@ -92,24 +126,20 @@ def register_twitter_tools(
             substack_link: URL of the published Substack article.
         """
         try:
-            frontmatter, _ = content_manager.process_markdown(file_path)
-            message = content_manager.generate_social_media_message(frontmatter, medium_link, substack_link)
-            result = twitter_publisher.publish_tweet(message)
-            monitoring_manager.increment_success_count("publish_tweet")
+            ctx = await self.content_manager.build_context(file_path, medium_link, substack_link)
+            result = self.twitter_publisher_factory().publish_tweet(ctx.message)
+            self.monitoring_manager.increment_success_count("publish_tweet")
             return result
-        except Exception as e:
-            monitoring_manager.increment_failure_count("publish_tweet")
-            raise exceptions.PublishingError(f"Failed to publish tweet: {str(e)}")
+        except exceptions.PublishingError:
+            # Already our domain error (includes validation failures); re-raise as-is
+            self.monitoring_manager.increment_failure_count("publish_tweet")
+            raise
+        except (aiohttp.ClientError, TimeoutError, ValueError, OSError) as e:
+            self.monitoring_manager.increment_failure_count("publish_tweet")
+            raise exceptions.PublishingError(f"Failed to publish tweet: {str(e)}") from e
 
-def register_bluesky_tools(
-    mcp: FastMCP,
-    content_manager: ContentManager,
-    monitoring_manager: MonitoringManager,
-    bluesky_publisher: BlueskyPublisher
-) -> None:
-    """Register Bluesky tools with the MCP server."""
-    @mcp.tool(name="publish_bluesky_post", description="Publishes a post to Bluesky")
-    async def publish_bluesky_post_tool(file_path: str, medium_link: str, substack_link: str):
+
+    async def publish_bluesky_post_tool(self, file_path: str, medium_link: str, substack_link: str):
         """
         Publishes a Bluesky post based on article content and provided links.
 
@@ -119,24 +149,20 @@ def register_bluesky_tools(
             substack_link: URL of the published Substack article.
         """
         try:
-            frontmatter, _ = content_manager.process_markdown(file_path)
-            message = content_manager.generate_social_media_message(frontmatter, medium_link, substack_link)
-            result = bluesky_publisher.publish_post(message)
-            monitoring_manager.increment_success_count("publish_bluesky_post")
+            ctx = await self.content_manager.build_context(file_path, medium_link, substack_link)
+            result = self.bluesky_publisher_factory().publish_post(ctx.message)
+            self.monitoring_manager.increment_success_count("publish_bluesky_post")
             return result
-        except Exception as e:
-            monitoring_manager.increment_failure_count("publish_bluesky_post")
-            raise exceptions.PublishingError(f"Failed to publish Bluesky post: {str(e)}")
+        except exceptions.PublishingError:
+            # Already our domain error (includes validation failures); re-raise as-is
+            self.monitoring_manager.increment_failure_count("publish_bluesky_post")
+            raise
+        except (aiohttp.ClientError, TimeoutError, ValueError, OSError) as e:
+            self.monitoring_manager.increment_failure_count("publish_bluesky_post")
+            raise exceptions.PublishingError(f"Failed to publish Bluesky post: {str(e)}") from e
 
-def register_reddit_tools(
-    mcp: FastMCP,
-    content_manager: ContentManager,
-    monitoring_manager: MonitoringManager,
-    reddit_publisher: RedditPublisher
-) -> None:
-    """Register Reddit tools with the MCP server."""
-    @mcp.tool(name="find_subreddits", description="Finds relevant subreddits based on article content")
-    async def find_subreddits_tool(file_path: str):
+
+    async def find_subreddits_tool(self, file_path: str):
         """
         Finds relevant subreddits based on the article's title and tags.
 
@@ -147,19 +173,19 @@ def register_reddit_tools(
             A list of relevant subreddit names.
         """
         try:
-            frontmatter, _ = content_manager.process_markdown(file_path)
-            keywords = [frontmatter.get('title', '')] + frontmatter.get('tags', [])
-            # Filter out empty keywords
-            keywords = [keyword for keyword in keywords if keyword]
-            relevant_subreddits = reddit_publisher.find_relevant_subreddits(keywords)
-            monitoring_manager.increment_success_count("find_subreddits")
+            ctx = await self.content_manager.build_context(file_path)
+            relevant_subreddits = self.reddit_publisher_factory().find_relevant_subreddits(ctx.keywords)
+            self.monitoring_manager.increment_success_count("find_subreddits")
             return relevant_subreddits
-        except Exception as e:
-            monitoring_manager.increment_failure_count("find_subreddits")
-            raise exceptions.PublishingError(f"Failed to find subreddits: {str(e)}")
+        except exceptions.PublishingError:
+            # Already our domain error (includes validation failures); re-raise as-is
+            self.monitoring_manager.increment_failure_count("find_subreddits")
+            raise
+        except (aiohttp.ClientError, TimeoutError, ValueError, OSError) as e:
+            self.monitoring_manager.increment_failure_count("find_subreddits")
+            raise exceptions.PublishingError(f"Failed to find subreddits: {str(e)}") from e
 
-    @mcp.tool(name="publish_reddit_post", description="Publishes a post to a specified subreddit")
-    async def publish_reddit_post_tool(file_path: str, subreddit: str, medium_link: str, substack_link: str):
+    async def publish_reddit_post_tool(self, file_path: str, subreddit: str, medium_link: str, substack_link: str):
         """
         Publishes a Reddit post based on article content and provided links.
 
@@ -170,68 +196,216 @@ def register_reddit_tools(
             substack_link: URL of the published Substack article.
         """
         try:
-            frontmatter, _ = content_manager.process_markdown(file_path)
-            title = frontmatter.get('title', 'New Article')
-            message = content_manager.generate_social_media_message(frontmatter, medium_link, substack_link)
-            result = reddit_publisher.publish_post(subreddit, title, message)
-            monitoring_manager.increment_success_count("publish_reddit_post")
+            ctx = await self.content_manager.build_context(file_path, medium_link, substack_link)
+            result = self.reddit_publisher_factory().publish_post(subreddit, ctx.title, ctx.message)
+            self.monitoring_manager.increment_success_count("publish_reddit_post")
             return result
-        except Exception as e:
-            monitoring_manager.increment_failure_count("publish_reddit_post")
-            raise exceptions.PublishingError(f"Failed to publish Reddit post: {str(e)}")
+        except exceptions.PublishingError:
+            # Already our domain error (includes validation failures); re-raise as-is
+            self.monitoring_manager.increment_failure_count("publish_reddit_post")
+            raise
+        except (aiohttp.ClientError, TimeoutError, ValueError, OSError) as e:
+            self.monitoring_manager.increment_failure_count("publish_reddit_post")
+            raise exceptions.PublishingError(f"Failed to publish Reddit post: {str(e)}") from e
+
+
+
+    async def publish_all_tool(
+        self,
+        file_path: str,
+        title: str,
+        subtitle: str = "",
+        tags: list = None,
+        public: bool = True,
+        is_paid: bool = False,
+        subreddit: str = "",
+        language: str = None
+    ):
+        """
+        Publishes an article to Medium and Substack concurrently, then fans the
+        resulting links out to Twitter, Bluesky and (optionally) Reddit in parallel.
+
+        The markdown file is processed once and shared across all platforms.
+
+        Args:
+            file_path: Path to the markdown file.
+            title: Post title.
+            subtitle: Optional subtitle (Substack).
+            tags: Optional list of tags (Medium).
+            public: Whether the Medium post is public or draft.
+            is_paid: Whether the Substack post is for paid subscribers.
+            subreddit: Optional subreddit to cross-post to.
+            language: Language code (e.g., 'en', 'es', 'fr').
+
+        Returns:
+            A dict mapping platform name to its result message or error string.
+        """
+        def _link_from(result) -> str:
+            # Publisher results are either confirmation strings ending in
+            # "URL: <link>" (Medium) or the bare post URL (Substack)
+            if not isinstance(result, str):
+                return ""
+            if "URL: " in result:
+                return result.rsplit("URL: ", 1)[1].strip()
+            if result.startswith(("http://", "https://")):
+                return result.strip()
+            return ""
+
+        results = {}
+        # Success per platform, decided by whether the publisher raised —
+        # return formats differ across publishers, so string prefixes are
+        # not a reliable signal.
+        statuses = {}
+        try:
+            frontmatter, content = await self.content_manager.process_markdown(file_path)
+
+            if not tags and 'tags' in frontmatter:
+                tags = frontmatter['tags']
+            if not language and 'language' in frontmatter:
+                language = frontmatter['language']
+
+            enabled = set(config.ENABLED_PLATFORMS)
+
+            # Stage 1: the long-form platforms, in parallel. Disabled
+            # platforms are skipped entirely rather than reported as
+            # failures: their factories would otherwise be called with
+            # unvalidated credentials.
+            stage_one = []
+            if 'medium' in enabled:
+                stage_one.append(('medium', self.medium_publisher_factory().publish_post(
+                    title=title, content=content, tags=tags, public=public, language=language
+                )))
+            if 'substack' in enabled:
+                stage_one.append(('substack', self.substack_publisher_factory().publish_automated(
+                    file_path=file_path, title=title, subtitle=subtitle, is_paid=is_paid, language=language
+                )))
+            stage_one_results = await asyncio.gather(
+                *(coro for _, coro in stage_one), return_exceptions=True
+            )
+            links = {'medium': "", 'substack': ""}
+            for (platform, _), result in zip(stage_one, stage_one_results):
+                results[platform] = str(result)
+                statuses[platform] = not isinstance(result, BaseException)
+                links[platform] = _link_from(result)
+
+            # Stage 2: social fan-out using the links from stage 1
+            message = self.content_manager.generate_social_media_message(
+                frontmatter, links['medium'], links['substack']
+            )
+
+            social_tasks = []
+            if 'twitter' in enabled:
+                social_tasks.append(
+                    ('twitter', asyncio.to_thread(self.twitter_publisher_factory().publish_tweet, message))
+                )
+            if 'bluesky' in enabled:
+                social_tasks.append(
+                    ('bluesky', asyncio.to_thread(self.bluesky_publisher_factory().publish_post, message))
+                )
+            if subreddit and 'reddit' in enabled:
+                social_tasks.append(
+                    ('reddit', asyncio.to_thread(self.reddit_publisher_factory().publish_post, subreddit, title, message))
+                )
+
+            async def _run(platform, awaitable):
+                try:
+                    return platform, str(await awaitable), True
+                except Exception as e:
+                    return platform, str(e), False
 
+            # Consume completions as they land rather than waiting for the
+            # slowest network: each platform's result and counters are
+            # recorded the moment it finishes.
+            for finished in asyncio.as_completed([_run(p, t) for p, t in social_tasks]):
+                platform, result, ok = await finished
+                results[platform] = result
+                statuses[platform] = ok
+                logger.info("publish_all: %s finished", platform)
+
+            for platform, ok in statuses.items():
+                if ok:
+                    self.monitoring_manager.increment_success_count(f"publish_all:{platform}")
+                else:
+                    self.monitoring_manager.increment_failure_count(f"publish_all:{platform}")
+
+            return results
+        except exceptions.PublishingError:
+            # Already our domain error (includes validation failures); re-raise as-is
+            self.monitoring_manager.increment_failure_count("publish_all")
+            raise
+        except (aiohttp.ClientError, TimeoutError, ValueError, OSError) as e:
+            self.monitoring_manager.increment_failure_count("publish_all")
+            raise exceptions.PublishingError(f"Failed to publish to all platforms: {str(e)}") from e
+
+    def specs(self, enabled: tuple) -> list:
+        """Collect (name, description, bound coroutine) specs for the enabled platforms."""
+        specs = []
+        if "twitter" in enabled:
+            specs.append(("publish_tweet", "Publishes a tweet to Twitter", self.publish_tweet_tool))
+        if "bluesky" in enabled:
+            specs.append(("publish_bluesky_post", "Publishes a post to Bluesky", self.publish_bluesky_post_tool))
+        if "reddit" in enabled:
+            specs.append(("find_subreddits", "Finds relevant subreddits based on article content", self.find_subreddits_tool))
+            specs.append(("publish_reddit_post", "Publishes a post to a specified subreddit", self.publish_reddit_post_tool))
+        specs.append(("publish_all", "Publishes an article to all configured platforms concurrently", self.publish_all_tool))
+        return specs
+
+def register_tool_specs(mcp: FastMCP, specs: list) -> None:
+    """Register collected (name, description, coroutine) specs in one pass.
+
+    Precomputes each coroutine's signature and stashes it on the function so
+    FastMCP's decorator reuses it instead of re-running introspection.
+    """
+    for name, description, fn in specs:
+        try:
+            fn.__signature__ = inspect.signature(fn)
+        except AttributeError:
+            # Bound methods reject attribute writes; FastMCP introspects normally
+            pass
+        mcp.tool(name=name, description=description)(fn)
 
 def register_tools(
     mcp: FastMCP,
     content_manager: ContentManager,
     security_manager: SecurityManager,
-    monitoring_manager: MonitoringManager,
-    medium_publisher: MediumPublisher,
-    substack_publisher: SubstackPublisher,
-    twitter_publisher: TwitterPublisher,
-    bluesky_publisher: BlueskyPublisher,
-    reddit_publisher: RedditPublisher
+    monitoring_manager: MonitoringManager
 ) -> None:
-    """Register all tools with the MCP server."""
-    # Register Substack tools
-    register_substack_tools(
-        mcp=mcp,
-        content_manager=content_manager,
-        monitoring_manager=monitoring_manager,
-        substack_publisher=substack_publisher
-    )
+    """Register all tools with the MCP server.
 
-    # Register Twitter tools
-    register_twitter_tools(
-        mcp=mcp,
-        content_manager=content_manager,
-        monitoring_manager=monitoring_manager,
-        twitter_publisher=twitter_publisher
-    )
+    Publishers are supplied as lazy factories so they are only built
+    (and authenticated) on first tool invocation.
+    """
+    enabled = config.ENABLED_PLATFORMS
 
-    # Register Bluesky tools
-    register_bluesky_tools(
-        mcp=mcp,
-        content_manager=content_manager,
-        monitoring_manager=monitoring_manager,
-        bluesky_publisher=bluesky_publisher
-    )
+    # Register Substack tools
+    if "substack" in enabled:
+        register_substack_tools(
+            mcp=mcp,
+            content_manager=content_manager,
+            monitoring_manager=monitoring_manager,
+            substack_publisher_factory=lambda: _substack(content_manager)
+        )
 
-    # Register Reddit tools
-    register_reddit_tools(
-        mcp=mcp,
+    # Collect the server-local tool specs and register them in one pass
+    publish_tools = PublishTools(
         content_manager=content_manager,
         monitoring_manager=monitoring_manager,
-        reddit_publisher=reddit_publisher
+        medium_publisher_factory=_medium,
+        substack_publisher_factory=lambda: _substack(content_manager),
+        twitter_publisher_factory=_twitter,
+        bluesky_publisher_factory=_bluesky,
+        reddit_publisher_factory=_reddit
     )
-    
+    register_tool_specs(mcp, publish_tools.specs(enabled))
+
     # Register Medium tools
-    register_medium_tools(
-        mcp=mcp,
-        content_manager=content_manager,
-        monitoring_manager=monitoring_manager,
-        medium_publisher=medium_publisher
-    )
+    if "medium" in enabled:
+        register_medium_tools(
+            mcp=mcp,
+            content_manager=content_manager,
+            monitoring_manager=monitoring_manager,
+            medium_publisher_factory=_medium
+        )
     
     # Register file tools
     register_file_tools(
@@ -252,12 +426,11 @@ async def main():
         # Validate configuration
         config.validate()
         
-        # Initialize managers and publishers
+        # Initialize managers; publishers are created lazily on first use
         content_manager, security_manager, monitoring_manager = initialize_managers()
-        medium_publisher, substack_publisher, twitter_publisher, bluesky_publisher, reddit_publisher = initialize_publishers() # Updated to include new publishers
-        
-        # Start metrics collection
-        monitoring_manager.start_metrics_collection()
+
+        # Start metrics collection on this event loop (no daemon threads)
+        monitoring_manager.start_metrics_collection_async()
         
         # Initialize MCP server
         mcp = FastMCP()
@@ -267,19 +440,14 @@ async def main():
             mcp=mcp,
             content_manager=content_manager,
             security_manager=security_manager,
-            monitoring_manager=monitoring_manager,
-            medium_publisher=medium_publisher,
-            substack_publisher=substack_publisher,
-            twitter_publisher=twitter_publisher,
-            bluesky_publisher=bluesky_publisher,
-            reddit_publisher=reddit_publisher
+            monitoring_manager=monitoring_manager
         )
         
         # Run server
         mcp.run(transport='sse')
         
     except Exception as e:
-        logger.error(f"Failed to start MCP server: {str(e)}")
+        logger.error("Failed to start MCP server: %s", e)
         raise
 
 if platform.system() == "Emscripten":
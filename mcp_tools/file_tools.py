@@ -1,8 +1,8 @@
 import logging
 from mcp.server.fastmcp import FastMCP
-from ..content_manager import ContentManager
-from ..monitoring import MonitoringManager
-from ..exceptions import ContentValidationError, PublishingError
+from src.content_manager import ContentManager
+from src.monitoring import MonitoringManager
+from src.exceptions import ContentValidationError, PublishingError
 
 logger = logging.getLogger(__name__)
 
@@ -28,20 +28,20 @@ def register_file_tools(
         
         try:
             # Use content_manager to read and process the file
-            frontmatter, content = content_manager.process_markdown(file_path, upload_images=False)
+            frontmatter, content = await content_manager.process_markdown(file_path, upload_images=False)
             return content
             
         except ContentValidationError as e:
             monitoring_manager.record_error("read_codebase_file", str(type(e).__name__))
-            logger.error(f"Content validation error reading file: {str(e)}")
+            logger.error("Content validation error reading file: %s", e)
             return f"Content validation error reading file: {str(e)}"
             
         except PublishingError as e:
             monitoring_manager.record_error("read_codebase_file", str(type(e).__name__))
-            logger.error(f"Error reading file: {str(e)}")
+            logger.error("Error reading file: %s", e)
             return f"Error reading file: {str(e)}"
             
         except Exception as e:
             monitoring_manager.record_error("read_codebase_file", str(type(e).__name__))
-            logger.error(f"An unexpected error occurred while reading file: {str(e)}")
+            logger.error("An unexpected error occurred while reading file: %s", e)
             return f"An unexpected error occurred while reading file: {str(e)}" 
\ No newline at end of file
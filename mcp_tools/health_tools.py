@@ -1,5 +1,5 @@
 from mcp.server.fastmcp import FastMCP
-from ..monitoring import MonitoringManager
+from src.monitoring import MonitoringManager
 
 def register_health_tools(
     mcp: FastMCP,
@@ -1,10 +1,11 @@
 import logging
-from typing import List, Optional
+import time
+from typing import Callable, List, Optional
 from mcp.server.fastmcp import FastMCP
-from ..publishers.medium_publisher import MediumPublisher
-from ..content_manager import ContentManager
-from ..monitoring import MonitoringManager
-from ..exceptions import PublishingError, ContentValidationError, APIError
+from publishers.medium_publisher import MediumPublisher
+from src.content_manager import ContentManager
+from src.monitoring import MonitoringManager
+from src.exceptions import PublishingError, ContentValidationError, APIError
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +13,7 @@ def register_medium_tools(
     mcp: FastMCP,
     content_manager: ContentManager,
     monitoring_manager: MonitoringManager,
-    medium_publisher: MediumPublisher
+    medium_publisher_factory: Callable[[], MediumPublisher]
 ) -> None:
     """Register Medium-related tools with the MCP server."""
     
@@ -37,12 +38,12 @@ def register_medium_tools(
         Returns:
             Confirmation message or error
         """
-        start_time = time.time()
-        monitoring_manager.record_request("publish_to_medium")
+        # Monotonic clock: immune to NTP jumps and cheaper than CLOCK_REALTIME
+        start_ns = time.monotonic_ns()
         
         try:
             # Process markdown content
-            frontmatter, content = content_manager.process_markdown(file_path)
+            frontmatter, content = await content_manager.process_markdown(file_path)
             
             # Use language from frontmatter if not specified
             if not language and 'language' in frontmatter:
@@ -53,7 +54,7 @@ def register_medium_tools(
                 tags = frontmatter['tags']
             
             # Publish to Medium
-            result = medium_publisher.publish_post(
+            result = await medium_publisher_factory().publish_post(
                 title=title,
                 content=content,
                 tags=tags,
@@ -61,16 +62,16 @@ def register_medium_tools(
                 language=language
             )
             
-            monitoring_manager.record_publish_latency("medium", time.time() - start_time)
-            logger.info(f"Successfully published to Medium: {title}")
+            monitoring_manager.record_publish("medium", (time.monotonic_ns() - start_ns) / 1e9)
+            logger.info("Successfully published to Medium: %s", title)
             return result
             
         except (PublishingError, APIError) as e:
-            monitoring_manager.record_error("publish_to_medium", str(type(e).__name__))
-            logger.error(f"Error publishing to Medium: {str(e)}")
+            monitoring_manager.record_publish("medium", (time.monotonic_ns() - start_ns) / 1e9, status='err')
+            logger.error("Error publishing to Medium: %s", e)
             return f"Error publishing to Medium: {str(e)}"
             
         except Exception as e:
-            monitoring_manager.record_error("publish_to_medium", str(type(e).__name__))
-            logger.error(f"An unexpected error occurred while publishing to Medium: {str(e)}")
+            monitoring_manager.record_publish("medium", (time.monotonic_ns() - start_ns) / 1e9, status='err')
+            logger.error("An unexpected error occurred while publishing to Medium: %s", e)
             return f"An unexpected error occurred while publishing to Medium: {str(e)}" 
\ No newline at end of file
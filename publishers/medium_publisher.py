@@ -1,9 +1,14 @@
-import requests
+import asyncio
 import logging
-import time
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, List
 
-from exceptions import PublishingError # Assuming PublishingError is in exceptions.py
+import httpx
+
+from src.exceptions import PublishingError # Assuming PublishingError is in exceptions.py
+from src.json_fast import dumps as _dumps
 
 logger = logging.getLogger(__name__)
 
@@ -15,27 +20,84 @@ class MediumPublisher:
     def __init__(self, api_key: str, api_url: str):
         self.api_key = api_key
         self.api_url = api_url # This will need to be the correct endpoint for creating posts
+        # Persistent async client: keep-alive amortizes the TLS handshake
+        # across publishes and retries, awaiting the round-trip lets other
+        # publish tasks progress, and static headers are encoded once.
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+        )
+        # Invariant payload fields, merged (not rebuilt) per publish
+        self._base_payload = {"contentFormat": "markdown"}
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client (server shutdown hook)."""
+        await self._client.aclose()
+
+    @staticmethod
+    def _backoff_delay(attempt: int, retry_after: str = None) -> float:
+        """Delay before the next retry: exponential backoff with jitter.
+
+        Jitter decorrelates concurrent publishers so they don't retry in
+        lockstep against the same rate limit. A server-supplied Retry-After
+        (seconds or HTTP-date) wins when it is longer than our own estimate.
+        """
+        delay = RETRY_DELAY * 2 ** attempt + random.uniform(0, 0.5)
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                try:
+                    remaining = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                    delay = max(delay, remaining)
+                except (TypeError, ValueError):
+                    pass
+        return delay
 
-    def make_api_request(self, url: str, headers: dict, payload: dict, retries: int = MAX_RETRIES) -> requests.Response:
-        """Make API request with retry logic"""
+    async def make_api_request(self, url: str, payload: dict, retries: int = MAX_RETRIES) -> httpx.Response:
+        """Make API request with retry logic and exponential backoff."""
+        # Pre-serialized body: bypasses the client's json.dumps path and
+        # lets retries resend the same bytes without re-encoding.
+        body = _dumps(payload)
         for attempt in range(retries):
             try:
-                response = requests.post(url, json=payload, headers=headers)
-                if response.status_code == 429:  # Rate limit
+                response = await self._client.post(url, content=body)
+                status = response.status_code
+                if status == 429:  # Rate limit
                     if attempt < retries - 1:
-                        logger.warning(f"Rate limited, retrying in {RETRY_DELAY} seconds...")
-                        time.sleep(RETRY_DELAY)
+                        delay = self._backoff_delay(attempt, response.headers.get("Retry-After"))
+                        logger.warning("Rate limited, retrying in %s seconds...", delay)
+                        await asyncio.sleep(delay)
                         continue
                 response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
                 return response
-            except requests.exceptions.RequestException as e:
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if 400 <= status < 500 and status != 429:
+                    # Client errors (bad payload, bad token, missing endpoint)
+                    # won't heal on retry; fail fast instead of burning the
+                    # full backoff schedule.
+                    raise PublishingError(f"API request failed with non-retryable status {status}: {str(e)}") from e
+                if attempt < retries - 1:
+                    delay = self._backoff_delay(attempt)
+                    logger.warning("Request failed, retrying in %s seconds...", delay)
+                    await asyncio.sleep(delay)
+                    continue
+                raise PublishingError(f"API request failed after {retries} attempts: {str(e)}") from e
+            except httpx.HTTPError as e:
                 if attempt < retries - 1:
-                    logger.warning(f"Request failed, retrying in {RETRY_DELAY} seconds...")
-                    time.sleep(RETRY_DELAY)
+                    delay = self._backoff_delay(attempt)
+                    logger.warning("Request failed, retrying in %s seconds...", delay)
+                    await asyncio.sleep(delay)
                     continue
-                raise PublishingError(f"API request failed after {retries} attempts: {str(e)}")
+                raise PublishingError(f"API request failed after {retries} attempts: {str(e)}") from e
 
-    def publish_post(self, title: str, content: str, tags: List[str] = None, public: bool = True, language: str = None) -> str:
+    async def publish_post(self, title: str, content: str, tags: List[str] = None, public: bool = True, language: str = None) -> str:
         """
         Publishes a post to Medium.
         Args:
@@ -48,26 +110,21 @@ class MediumPublisher:
             Confirmation message or error
         """
         payload = {
+            **self._base_payload,
             "title": title,
-            "contentFormat": "markdown",
             "content": content,
-            "tags": tags or [],
+            "tags": list(tags) if tags else [],
             "language": language,
             "publishStatus": "public" if public else "draft"
         }
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-
         # Note: The MEDIUM_API_URL defined above is likely incorrect for creating posts.
         # The correct endpoint is typically users/{authorId}/posts.
         # This will need to be updated with the correct author ID and endpoint.
         # For now, using the potentially incorrect URL for structural refactoring.
-        response = self.make_api_request(self.api_url, headers, payload)
+        response = await self.make_api_request(self.api_url, payload)
 
         # Assuming a successful response returns the created post details
         # The actual response structure might differ based on the correct Medium API endpoint
         post_url = response.json().get('url', 'N/A')
-        return f"Successfully published to Medium. Post URL: {post_url}"
\ No newline at end of file
+        return f"Successfully published to Medium. Post URL: {post_url}"
@@ -1,7 +1,9 @@
+import itertools
 import logging
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List
 
-from exceptions import PublishingError
+from src.exceptions import PublishingError
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +19,31 @@ class RedditPublisher:
         self.user_agent = user_agent
         # TODO: Initialize Reddit API client (PRAW) here
 
-    def find_relevant_subreddits(self, keywords: List[str], limit: int = 10) -> List[str]:
+    def _iter_candidate_subreddits(self, keywords: tuple) -> Iterator[str]:
+        """Lazily yield deduplicated subreddit candidates per keyword.
+
+        Generator by design: once wired to the Reddit search API
+        (paginated and lazy itself), callers can stop at the first N
+        matches without the full result set ever being materialized.
+        """
+        seen = set()
+        # TODO: Replace with reddit.subreddits.search_by_name(keyword)
+        # per keyword once the API client is wired up. The placeholder
+        # mirrors one page of search results per keyword.
+        per_keyword = ((f"subreddit_{keyword}_{i}" for i in range(25)) for keyword in keywords)
+        for name in itertools.chain.from_iterable(per_keyword):
+            if name not in seen:
+                seen.add(name)
+                yield name
+
+    @lru_cache(maxsize=512)
+    def find_relevant_subreddits(self, keywords: tuple, limit: int = 10) -> List[str]:
         """
-        Finds relevant subreddits based on keywords.
+        Finds relevant subreddits based on keywords. Results are memoized per
+        (keywords, limit) so repeat lookups for the same article are free.
 
         Args:
-            keywords: A list of keywords to search for.
+            keywords: A tuple of keywords to search for.
             limit: The maximum number of subreddits to return.
 
         Returns:
@@ -30,9 +51,9 @@ class RedditPublisher:
         """
         try:
             logger.info(f"Attempting to find relevant subreddits for keywords: {keywords}")
-            # TODO: Implement Reddit API call to search for subreddits
-            # Consider criteria for high activity and relevance
-            relevant_subreddits = [f"subreddit_{i}" for i in range(limit)] # Placeholder
+            # Early-stop: the generator is only consumed up to `limit`,
+            # so search pagination beyond that never happens.
+            relevant_subreddits = list(itertools.islice(self._iter_candidate_subreddits(keywords), limit))
             logger.info(f"Found relevant subreddits: {relevant_subreddits}")
             return relevant_subreddits
         except Exception as e:
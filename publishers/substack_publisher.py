@@ -1,18 +1,168 @@
+import asyncio
+import atexit
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List
+import re
+import string
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
 
-from playwright.sync_api import sync_playwright, BrowserContext, Page
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page
 
-from content_manager import ContentManager
-from exceptions import PublishingError, ContentValidationError # Assuming exceptions are in exceptions.py
-from config import config # Import config for credentials and settings
+from src.content_manager import ContentManager
+from src.exceptions import PublishingError, ContentValidationError # Assuming exceptions are in exceptions.py
+from config import get_settings # Import settings accessor for credentials and settings
+from src.transform_cache import TransformCache
+
+config = get_settings()
+
+# Shared across publishes: the same post sent to several networks (or
+# retried) normalizes once and replays from cache afterwards.
+_transform_cache = TransformCache()
+_BLANK_LINES = re.compile(r'\n{3,}')
+_TRAILING_WS = re.compile(r'[ \t]+$', re.MULTILINE)
+
+def _normalize_markdown(content: str) -> str:
+    """Trim trailing whitespace and collapse blank-line runs.
+
+    Smaller bodies paste faster into the editor and the normalization is
+    idempotent, so it is safe to cache by content hash.
+    """
+    return _BLANK_LINES.sub('\n\n', _TRAILING_WS.sub('', content)).strip()
 
 logger = logging.getLogger(__name__)
 
+# Manual publishing instructions compiled once at import. Template's
+# precompiled placeholder regex substitutes the variable fields in a
+# single pass over the boilerplate.
+_INSTRUCTION_TEMPLATE = string.Template("""
+Substack Publishing Instructions:
+
+1. Log in to your Substack dashboard
+2. Click "New Post"
+3. Copy and paste the following content:
+
+Title: $title
+Subtitle: $subtitle
+Paid: $paid
+Language: $language
+
+Content:
+$content
+
+Note: You'll need to manually:
+- Format the content in Substack's editor
+- Add any images
+- Set the publication date
+- Configure any additional settings
+""")
+
+class BrowserPool:
+    """One shared browser, many cheap isolated BrowserContexts.
+
+    Contexts are ~100x cheaper to create than browsers and fully isolate
+    cookies/storage, so concurrent publishes share the browser while each
+    gets its own context. A semaphore bounds how many contexts a burst of
+    publishes can open at once. With a CDP endpoint configured, the pool
+    connects to a remote browser over CDP instead of launching locally.
+    """
+    def __init__(self, browser_type: str, headless: bool, cdp_endpoint: Optional[str] = None, max_contexts: int = 10):
+        self.browser_type = browser_type
+        self.headless = headless
+        self.cdp_endpoint = cdp_endpoint
+        self._playwright = None
+        self._browser: Optional["Browser"] = None
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_contexts)
+
+    async def _ensure_browser(self) -> "Browser":
+        """Return the shared long-lived browser, launching it on first use."""
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    # Deferred import: playwright is a heavy module and only
+                    # Substack publishes need it, so server startup (and
+                    # Medium/Twitter-only deployments) never pay for it.
+                    from playwright.async_api import async_playwright
+                    self._playwright = await async_playwright().start()
+                if self.cdp_endpoint:
+                    self._browser = await self._playwright.chromium.connect_over_cdp(self.cdp_endpoint)
+                else:
+                    self._browser = await self._playwright[self.browser_type].launch(headless=self.headless)
+            return self._browser
+
+    @asynccontextmanager
+    async def acquire(self, **context_kwargs):
+        """Yield a fresh BrowserContext from the shared browser."""
+        async with self._semaphore:
+            browser = await self._ensure_browser()
+            context = await browser.new_context(**context_kwargs)
+            try:
+                yield context
+            finally:
+                await context.close()
+
+    async def close(self) -> None:
+        """Close the shared browser and stop Playwright."""
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                await self._browser.close()
+            self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
 class SubstackPublisher:
     """
     Handles automated content publishing to Substack via browser automation.
+
+    All publishes share one lazily launched browser through BrowserPool;
+    each publish gets its own BrowserContext. The logged-in session is
+    persisted via storage_state so warm calls skip the login round-trip.
     """
+    _pool: Optional[BrowserPool] = None
+    _shutdown_registered = False
+    _storage_state_path = Path.home() / ".mcp_publishflow" / "substack_storage_state.json"
+
+    # Selectors as class constants: built once, shared by every publish,
+    # and bound to per-page Locators at use sites. TODO: Verify selectors.
+    EMAIL_SEL = 'input[name="email"]'
+    PASSWORD_SEL = 'input[name="password"]'
+    SUBMIT_SEL = 'button[type="submit"]'
+    TITLE_SEL = 'input[placeholder="Title"]'
+    SUBTITLE_SEL = 'input[placeholder="Subtitle"]'
+    CONTENT_SEL = '.editor-content'
+    PUBLISH_SEL = 'button:has-text("Publish")'
+    POST_LINK_SEL = 'a.post-link'
+
+    @classmethod
+    def _get_pool(cls, browser_type: str, headless: bool) -> BrowserPool:
+        """Return the shared browser pool, creating it on first use."""
+        if cls._pool is None:
+            cls._pool = BrowserPool(
+                browser_type=browser_type,
+                headless=headless,
+                cdp_endpoint=config.CDP_ENDPOINT
+            )
+            if not cls._shutdown_registered:
+                atexit.register(cls._shutdown_pool)
+                cls._shutdown_registered = True
+        return cls._pool
+
+    @classmethod
+    def _shutdown_pool(cls) -> None:
+        """Close the shared browser pool at process exit."""
+        if cls._pool is None:
+            return
+        try:
+            asyncio.run(cls._pool.close())
+        except RuntimeError:
+            # Event loop already running/closed during interpreter shutdown
+            pass
+        cls._pool = None
+
     def __init__(self, content_manager: ContentManager):
         self.content_manager = content_manager
         self.substack_url = "https://substack.com" # Base Substack URL
@@ -23,7 +173,7 @@ class SubstackPublisher:
         self.browser_type = config.PLAYWRIGHT_BROWSER # Get browser type from config
         self.headless = config.PLAYWRIGHT_HEADLESS # Get headless setting from config
 
-    def publish_automated(self, file_path: str, title: str, subtitle: str = "", is_paid: bool = False, language: str = None) -> str:
+    async def publish_automated(self, file_path: str, title: str, subtitle: str = "", is_paid: bool = False, language: str = None) -> str:
         """
         Publishes content to Substack automatically using Playwright.
 
@@ -37,22 +187,28 @@ class SubstackPublisher:
             URL of the published post or a success message.
         """
         try:
-            frontmatter, content = self.content_manager.process_markdown(file_path)
+            frontmatter, content = await self.content_manager.process_markdown(file_path)
 
             if not language and 'language' in frontmatter:
                 language = frontmatter['language']
             elif not language:
                  language = self.content_manager.default_language
 
-            with sync_playwright() as p:
-                browser = p[self.browser_type].launch(headless=self.headless)
-                context = browser.new_context()
-                page = context.new_page()
-
-                self._login(page)
-                post_url = self._create_and_publish_post(page, title, subtitle, content, is_paid, language)
-
-                browser.close()
+            # Normalize once per unique content; repeat publishes of the
+            # same file replay the cached transform.
+            content_key = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+            content = _transform_cache.get_or_compute(content_key, lambda: _normalize_markdown(content))
+
+            pool = self._get_pool(self.browser_type, self.headless)
+            storage_state = str(self._storage_state_path) if self._storage_state_path.is_file() else None
+            async with pool.acquire(storage_state=storage_state) as context:
+                page = await context.new_page()
+                if storage_state is None:
+                    # Cold path: log in once and persist the session for reuse
+                    await self._login(page)
+                    self._storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+                    await context.storage_state(path=str(self._storage_state_path))
+                post_url = await self._create_and_publish_post(page, title, subtitle, content, is_paid, language)
 
             logger.info(f"Published content to Substack: {title}")
             return post_url if post_url else "Post published successfully (URL not captured)."
@@ -64,40 +220,68 @@ class SubstackPublisher:
             logger.error(f"An unexpected error occurred while publishing to Substack: {str(e)}")
             raise # Re-raise the exception after logging
 
-    def _login(self, page: Page):
+    async def _login(self, page: "Page"):
         """Logs into Substack."""
         logger.info("Attempting to log in to Substack...")
-        page.goto(self.login_url)
+        await page.goto(self.login_url)
 
         try:
             # Fill in email and password
-            page.fill('input[name="email"]', self.username) # TODO: Verify selector
-            page.fill('input[name="password"]', self.password) # TODO: Verify selector
+            await page.locator(self.EMAIL_SEL).fill(self.username)
+            await page.locator(self.PASSWORD_SEL).fill(self.password)
 
             # Click login button
-            page.click('button[type="submit"]') # TODO: Verify selector
+            await page.locator(self.SUBMIT_SEL).click()
 
             # Wait for navigation after login
-            page.wait_for_url(self.substack_url) # Wait for redirect after login
+            await page.wait_for_url(self.substack_url) # Wait for redirect after login
             logger.info("Successfully logged in to Substack.")
 
         except Exception as e:
             logger.error(f"Substack login failed: {str(e)}")
             raise PublishingError(f"Substack login failed: {str(e)}")
 
-    def _create_and_publish_post(self, page: Page, title: str, subtitle: str, content: str, is_paid: bool, language: str) -> Optional[str]:
+    async def _insert_content(self, page: "Page", selector: str, content: str) -> None:
+        """Insert a large text body into the editor in a single round-trip.
+
+        page.fill types the content in batches, which for a long post means
+        many WebSocket round-trips. CDP Input.insertText pastes the whole
+        body at once; if the editor rejects synthetic insertText we fall
+        back to a clipboard paste, which rich-text editors always handle.
+        """
+        await page.focus(selector)
+        try:
+            client = await page.context.new_cdp_session(page)
+            await client.send('Input.insertText', {'text': content})
+            await client.detach()
+        except Exception:
+            # Non-Chromium browser or editor swallowed the event: paste instead
+            await page.evaluate("text => navigator.clipboard.writeText(text)", content)
+            await page.keyboard.press('Control+V')
+
+    async def _create_and_publish_post(self, page: "Page", title: str, subtitle: str, content: str, is_paid: bool, language: str) -> Optional[str]:
         """Creates a new post and publishes it."""
         logger.info(f"Attempting to create and publish post: {title}")
-        page.goto(self.new_post_url)
+        await page.goto(self.new_post_url)
 
         try:
-            # Fill in title and subtitle
-            page.fill('input[placeholder="Title"]', title) # TODO: Verify selector
-            page.fill('input[placeholder="Subtitle"]', subtitle) # TODO: Verify selector
+            # Fill title and subtitle in one evaluate: a single CDP
+            # round-trip instead of one per field, which matters on
+            # remote/CDP-connected browsers.
+            await page.evaluate(
+                """({fields}) => {
+                    for (const [selector, value] of fields) {
+                        const el = document.querySelector(selector);
+                        if (!el) throw new Error(`missing element: ${selector}`);
+                        el.value = value;
+                        el.dispatchEvent(new Event('input', {bubbles: true}));
+                    }
+                }""",
+                {"fields": [[self.TITLE_SEL, title], [self.SUBTITLE_SEL, subtitle]]},
+            )
 
             # Fill in content (assuming a rich text editor or markdown area)
-            # This selector is highly likely to be incorrect and needs verification
-            page.fill('.editor-content', content) # TODO: Verify selector for content area
+            await self._insert_content(page, self.CONTENT_SEL, content)
 
             # Handle is_paid setting
             if is_paid:
@@ -110,12 +294,11 @@ class SubstackPublisher:
                  # TODO: Add Playwright steps if Substack UI allows setting language per post
 
             # Click publish button
-            # This selector is highly likely to be incorrect and needs verification
-            page.click('button:has-text("Publish")') # TODO: Verify selector for publish button
+            await page.locator(self.PUBLISH_SEL).click()
 
             # Wait for publishing to complete and get the post URL
             # This is a placeholder and needs actual logic to get the URL
-            page.wait_for_selector('a.post-link') # Example: Wait for a link to the new post
+            await page.wait_for_selector(self.POST_LINK_SEL) # Example: Wait for a link to the new post
             post_url = page.url # This might not be the final post URL, needs verification
 
             logger.info(f"Post creation and publishing steps completed for: {title}")
@@ -125,9 +308,20 @@ class SubstackPublisher:
             logger.error(f"Substack post creation/publishing failed for '{title}': {str(e)}")
             raise PublishingError(f"Substack post creation/publishing failed for '{title}': {str(e)}")
 
+    @staticmethod
+    def prepare_publishing_instructions(title: str, content: str, subtitle: str = "", is_paid: bool = False, language: str = None) -> str:
+        """Render the manual publishing instructions for already-processed content."""
+        return _INSTRUCTION_TEMPLATE.substitute(
+            title=title,
+            subtitle=subtitle,
+            paid="Yes" if is_paid else "No",
+            language=language or "",
+            content=content,
+        )
+
     # The original prepare_post method can be kept or removed depending on need.
     # Keeping it for now as it might be used elsewhere for manual instructions.
-    def prepare_post(self, file_path: str, title: str, subtitle: str = "", is_paid: bool = False, language: str = None) -> str:
+    async def prepare_post(self, file_path: str, title: str, subtitle: str = "", is_paid: bool = False, language: str = None) -> str:
         """
         Prepares content for manual publishing to Substack.
 
@@ -142,7 +336,7 @@ class SubstackPublisher:
         """
         try:
             # Process markdown content using ContentManager
-            frontmatter, content = self.content_manager.process_markdown(file_path)
+            frontmatter, content = await self.content_manager.process_markdown(file_path)
 
             # Use language from frontmatter if not specified
             if not language and 'language' in frontmatter:
@@ -153,27 +347,13 @@ class SubstackPublisher:
 
 
             # Prepare content for manual publishing
-            instructions = f"""
-Substack Publishing Instructions:
-
-1. Log in to your Substack dashboard
-2. Click "New Post"
-3. Copy and paste the following content:
-
-Title: {title}
-Subtitle: {subtitle}
-Paid: {'Yes' if is_paid else 'No'}
-Language: {language}
-
-Content:
-{content}
-
-Note: You'll need to manually:
-- Format the content in Substack's editor
-- Add any images
-- Set the publication date
-- Configure any additional settings
-"""
+            instructions = self.prepare_publishing_instructions(
+                title=title,
+                content=content,
+                subtitle=subtitle,
+                is_paid=is_paid,
+                language=language
+            )
 
             logger.info(f"Prepared content for Substack: {title}")
             return instructions
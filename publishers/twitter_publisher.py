@@ -1,7 +1,7 @@
 import logging
 from typing import Dict, Any
 
-from exceptions import PublishingError
+from src.exceptions import PublishingError
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,41 @@
+"""Shared pytest fixtures for the test suite.
+
+The unittest-style classes keep their own setUpClass fixtures; these
+session-scoped ones are for pytest-style tests so the markdown fixture
+is written once per test session rather than once per class.
+"""
+
+import mmap
+
+import pytest
+
+VALID_CONTENT_BYTES = b"""---
+title: Test Title
+subtitle: Test Subtitle
+tags: [test, markdown]
+language: en
+---
+
+# This is a test article
+
+Some content here.
+"""
+
+
+@pytest.fixture(scope="session")
+def valid_md(tmp_path_factory):
+    """Path to the canonical valid markdown fixture, written once per session."""
+    path = tmp_path_factory.mktemp("cm") / "article.md"
+    path.write_bytes(VALID_CONTENT_BYTES)
+    return path
+
+
+def read_fixture_mmap(path) -> str:
+    """Read a fixture file through a zero-copy read-only mapping.
+
+    Negligible for the current fixtures, but keeps larger future bundles
+    (image + markdown) from being copied per test.
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return bytes(mm).decode("utf-8")
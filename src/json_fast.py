@@ -0,0 +1,29 @@
+"""Fast JSON serialization shared by the publisher HTTP paths.
+
+orjson serializes 3-10x faster than the stdlib and emits bytes directly,
+which matters for large markdown bodies. The stdlib fallback keeps the
+module importable when orjson isn't installed.
+"""
+
+try:
+    import orjson
+
+    dumps = orjson.dumps
+
+    def dumps_str(obj) -> str:
+        """str-returning variant for APIs that require text (aiohttp)."""
+        return orjson.dumps(obj).decode()
+
+    def dumps_pretty(obj) -> bytes:
+        """Indented bytes for human-readable files (metrics dumps)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    import json
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    dumps_str = json.dumps
+
+    def dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
@@ -1,30 +1,198 @@
+import array
+import asyncio
+import collections
+import os
+import random
 import time
 import psutil
 import logging
-from typing import Dict, Any
+from bisect import bisect_left
+from typing import Any, Dict, Optional
 from datetime import datetime
-import json
+from .json_fast import dumps_pretty
 from pathlib import Path
 import requests
-from prometheus_client import start_http_server, Counter, Gauge, Histogram
+from prometheus_client import REGISTRY, start_http_server, Counter, Gauge, Histogram
+from prometheus_client.core import HistogramMetricFamily
+import prometheus_client.values
 import threading
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds of the latency buckets (prometheus_client defaults, minus
+# the implicit +Inf bucket tracked as the overflow slot).
+_LATENCY_BUCKET_BOUNDS = array.array(
+    'd', (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1.0, 2.5, 5.0, 7.5, 10.0)
+)
+
+class _LatencyHistogram:
+    """Bisect-based latency histogram exposed as a Prometheus collector.
+
+    prometheus_client's Histogram.observe walks the bucket list in a
+    Python loop per observation; here bucket selection is one C-level
+    bisect plus an integer increment, and the cumulative Prometheus
+    sample format is only materialized at scrape time.
+    """
+
+    def __init__(self, name: str, documentation: str, registry=REGISTRY):
+        self._name = name
+        self._documentation = documentation
+        self._bounds = _LATENCY_BUCKET_BOUNDS
+        self._bucket_counts: Dict[tuple, array.array] = {}
+        self._sums: Dict[tuple, float] = {}
+        registry.register(self)
+
+    def observe(self, platform: str, duration: float, status: str = 'ok'):
+        key = (platform, status)
+        counts = self._bucket_counts.get(key)
+        if counts is None:
+            counts = self._bucket_counts.setdefault(
+                key, array.array('Q', [0] * (len(self._bounds) + 1))
+            )
+            self._sums.setdefault(key, 0.0)
+        counts[bisect_left(self._bounds, duration)] += 1
+        self._sums[key] += duration
+
+    def collect(self):
+        family = HistogramMetricFamily(
+            self._name, self._documentation, labels=['platform', 'status']
+        )
+        for key, counts in self._bucket_counts.items():
+            cumulative = 0
+            buckets = []
+            for bound, n in zip(self._bounds, counts):
+                cumulative += n
+                buckets.append((str(bound), cumulative))
+            buckets.append(('+Inf', cumulative + counts[-1]))
+            family.add_metric(list(key), buckets, self._sums[key])
+        return [family]
+
+class _UnlockedValue:
+    """Lock-free drop-in for prometheus_client's MutexValue.
+
+    The default value class takes a threading.Lock per inc()/set(); in a
+    single-threaded asyncio worker (and in our flush path, where updates
+    are already serialized behind _pending_lock) that lock is pure
+    overhead. Float += on the GIL is atomic enough for these tallies.
+    """
+    _multiprocess = False
+
+    def __init__(self, typ, metric_name, name, labelnames, labelvalues, help_text, **kwargs):
+        self._value = 0.0
+        self._exemplar = None
+
+    def inc(self, amount):
+        self._value += amount
+
+    def set(self, value, timestamp=None):
+        self._value = value
+
+    def set_exemplar(self, exemplar):
+        self._exemplar = exemplar
+
+    def get(self):
+        return self._value
+
+    def get_exemplar(self):
+        return self._exemplar
+
+# Gauges that describe the whole process tree; only one worker samples them.
+PROCESS_LEVEL_METRICS = {'memory_usage', 'cpu_usage'}
+
+def _counter_total(counter) -> float:
+    """Sum a labelled counter's children into one scalar total."""
+    return sum(
+        sample.value
+        for sample in counter.collect()[0].samples
+        if sample.name.endswith('_total')
+    )
+
 class MonitoringManager:
-    def __init__(self, metrics_port: int = 9090):
+    def __init__(self, metrics_port: int = 9090, is_process_collector: Optional[bool] = None,
+                 single_threaded: bool = True, redis_client=None, registry=REGISTRY,
+                 start_background: bool = True):
         self.metrics_port = metrics_port
         self.start_time = time.time()
+        # Swap in the lock-free value class before any metric is built.
+        # Leave the default MutexValue in place for deployments that
+        # update metrics from multiple threads directly.
+        if single_threaded:
+            prometheus_client.values.ValueClass = _UnlockedValue
+        # Under a multi-worker server every worker would otherwise read
+        # /proc independently; only the designated collector (worker 0 by
+        # default, overridable via the ctor flag) samples process-level
+        # gauges. Per-request counters remain per-worker.
+        if is_process_collector is None:
+            is_process_collector = os.environ.get('WORKER_ID', '0') == '0'
+        self.is_process_collector = is_process_collector
         
         # Initialize Prometheus metrics
-        self.request_count = Counter('mcp_publish_requests_total', 'Total number of requests')
-        self.error_count = Counter('mcp_publish_errors_total', 'Total number of errors')
-        self.publish_latency = Histogram('mcp_publish_latency_seconds', 'Publishing latency in seconds')
-        self.memory_usage = Gauge('mcp_publish_memory_bytes', 'Memory usage in bytes')
-        self.cpu_usage = Gauge('mcp_publish_cpu_percent', 'CPU usage percentage')
-        
-        # Start metrics server
-        self.start_metrics_server()
+        self.request_count = Counter('mcp_publish_requests_total', 'Total number of requests', ['endpoint'], registry=registry)
+        self.error_count = Counter('mcp_publish_errors_total', 'Total number of errors', ['endpoint', 'error_type'], registry=registry)
+        self.publish_latency = _LatencyHistogram('mcp_publish_latency_seconds', 'Publishing latency in seconds', registry=registry)
+        self.memory_usage = Gauge('mcp_publish_memory_bytes', 'Memory usage in bytes', registry=registry)
+        self.cpu_usage = Gauge('mcp_publish_cpu_percent', 'CPU usage percentage', registry=registry)
+        # Per-tool outcome counters. prometheus_client children use atomic
+        # increments, so the tool hot path takes no metrics lock; the child
+        # cache skips the labels() tuple-hash lookup after first use.
+        self.success_count = Counter('mcp_publish_success_total', 'Total number of successful tool calls', ['tool'], registry=registry)
+        self.failure_count = Counter('mcp_publish_failure_total', 'Total number of failed tool calls', ['tool'], registry=registry)
+        self._success_children: Dict[str, Any] = {}
+        self._failure_children: Dict[str, Any] = {}
+
+        # Last sampled system stats, written only by the background
+        # collector thread so request handlers never touch /proc. Prime
+        # cpu_percent once so later no-interval reads are cheap deltas.
+        if self.is_process_collector:
+            psutil.cpu_percent(interval=None)
+        self._sys_lock = threading.Lock()
+        self._sys_snapshot = {'rss': 0, 'cpu': 0.0, 'ts': 0.0}
+        # Throttle for concurrent samplers: at most one psutil read per
+        # _min_interval regardless of how many scrapes pile up.
+        self._collect_lock = threading.Lock()
+        self._last_collect = 0.0
+        self._min_interval = 1.0
+
+        # Optional Redis-backed gauges, read by the collector tick. All
+        # registered keys are fetched through one non-transactional
+        # pipeline so a tick costs a single round trip however many keys
+        # are tracked.
+        self.redis = redis_client
+        self._redis_gauges: Dict[str, Gauge] = {}
+
+        # Per-second memo of the ISO timestamp string; formatting a
+        # datetime costs microseconds per call, which adds up on /health.
+        self._iso_cache = ('', 0)
+
+        # Request/error/latency updates are batched here and drained into
+        # the Prometheus registry by the flush thread, so the request path
+        # pays one short dict update instead of a registry mutex acquire
+        # (and an O(bins) scan per histogram observe).
+        self._pending_lock = threading.Lock()
+        self._pending_counts = collections.Counter()
+        self._pending_latency = collections.defaultdict(list)
+
+        # Bernoulli sampling for latency observations. The rate adapts at
+        # flush time so that above _latency_target_rate observations/sec
+        # only a representative fraction is recorded; quantiles are
+        # unaffected by uniform sampling, only resolution drops.
+        self._latency_sample_rate = 1.0
+        self._latency_target_rate = 100.0
+        self._last_latency_flush = time.monotonic()
+
+        # Start metrics server (skipped under start_background=False so
+        # tests can build managers without touching the network stack).
+        if start_background:
+            self.start_metrics_server()
+
+    def _iso_now(self) -> str:
+        """ISO-8601 UTC timestamp, re-formatted at most once per second."""
+        now = int(time.time())
+        iso, second = self._iso_cache
+        if second != now:
+            iso = datetime.utcfromtimestamp(now).isoformat()
+            self._iso_cache = (iso, now)
+        return iso
 
     def start_metrics_server(self):
         """Start the Prometheus metrics server."""
@@ -34,70 +202,213 @@ class MonitoringManager:
         except Exception as e:
             logger.error(f"Failed to start metrics server: {str(e)}")
 
+    def _sample_system_metrics(self):
+        """Read psutil and refresh the cached snapshot.
+
+        Double-checked throttle: concurrent callers that arrive within
+        _min_interval of a completed sample return without touching
+        psutil, so piled-up scrapes coalesce into one /proc read.
+        """
+        if not self.is_process_collector:
+            return
+        if time.monotonic() - self._last_collect < self._min_interval:
+            return
+        with self._collect_lock:
+            if time.monotonic() - self._last_collect < self._min_interval:
+                return
+            rss = psutil.Process().memory_info().rss
+            cpu = psutil.cpu_percent(interval=None)
+            self._last_collect = time.monotonic()
+        with self._sys_lock:
+            self._sys_snapshot = {'rss': rss, 'cpu': cpu, 'ts': time.time()}
+
     def update_system_metrics(self):
-        """Update system metrics."""
-        self.memory_usage.set(psutil.Process().memory_info().rss)
-        self.cpu_usage.set(psutil.cpu_percent())
+        """Update system metric gauges from the cached snapshot."""
+        if not self.is_process_collector:
+            return
+        with self._sys_lock:
+            snapshot = self._sys_snapshot
+        self.memory_usage.set(snapshot['rss'])
+        self.cpu_usage.set(snapshot['cpu'])
 
     def record_request(self, endpoint: str):
         """Record a request."""
-        self.request_count.labels(endpoint=endpoint).inc()
+        with self._pending_lock:
+            self._pending_counts[('request', endpoint)] += 1
 
     def record_error(self, endpoint: str, error_type: str):
         """Record an error."""
-        self.error_count.labels(endpoint=endpoint, error_type=error_type).inc()
+        with self._pending_lock:
+            self._pending_counts[('error', endpoint, error_type)] += 1
+
+    def increment_success_count(self, tool: str):
+        """Record a successful tool call."""
+        child = self._success_children.get(tool)
+        if child is None:
+            child = self._success_children.setdefault(tool, self.success_count.labels(tool=tool))
+        child.inc()
+
+    def increment_failure_count(self, tool: str):
+        """Record a failed tool call."""
+        child = self._failure_children.get(tool)
+        if child is None:
+            child = self._failure_children.setdefault(tool, self.failure_count.labels(tool=tool))
+        child.inc()
+
+    def record_publish(self, platform: str, duration: float, status: str = 'ok'):
+        """Record one publish outcome as a single fused observation.
+
+        The histogram's _count doubles as the request counter and the
+        status label carries success/failure, so a publish costs one
+        batched entry instead of separate counter + histogram updates.
+        Failures are never downsampled; they are rare and always wanted.
+        """
+        if status == 'ok' and self._latency_sample_rate < 1.0 \
+                and random.random() >= self._latency_sample_rate:
+            return
+        with self._pending_lock:
+            self._pending_latency[(platform, status)].append(duration)
 
     def record_publish_latency(self, platform: str, duration: float):
-        """Record publishing latency."""
-        self.publish_latency.labels(platform=platform).observe(duration)
+        """Record publishing latency (possibly downsampled under load)."""
+        self.record_publish(platform, duration)
+
+    def flush_pending_metrics(self):
+        """Drain batched updates into the Prometheus registry."""
+        with self._pending_lock:
+            if not self._pending_counts and not self._pending_latency:
+                return
+            counts, self._pending_counts = self._pending_counts, collections.Counter()
+            latencies, self._pending_latency = self._pending_latency, collections.defaultdict(list)
+
+        for key, n in counts.items():
+            if key[0] == 'request':
+                self.request_count.labels(endpoint=key[1]).inc(n)
+            else:
+                self.error_count.labels(endpoint=key[1], error_type=key[2]).inc(n)
+        recorded = 0
+        for (platform, status), durations in latencies.items():
+            recorded += len(durations)
+            for duration in durations:
+                self.publish_latency.observe(platform, duration, status)
+
+        # Adapt the sample rate toward the target observation rate.
+        now = time.monotonic()
+        elapsed = now - self._last_latency_flush
+        self._last_latency_flush = now
+        if elapsed > 0:
+            # Estimated true rate, compensating for current downsampling.
+            estimated = (recorded / elapsed) / self._latency_sample_rate
+            if estimated > self._latency_target_rate:
+                self._latency_sample_rate = self._latency_target_rate / estimated
+            else:
+                self._latency_sample_rate = 1.0
 
     def get_health_status(self) -> Dict[str, Any]:
         """Get health status of the service."""
         try:
             uptime = time.time() - self.start_time
-            memory = psutil.Process().memory_info().rss
-            cpu = psutil.cpu_percent()
-            
+            with self._sys_lock:
+                snapshot = self._sys_snapshot
+            memory = snapshot['rss']
+            cpu = snapshot['cpu']
+
             return {
                 'status': 'healthy',
                 'uptime': uptime,
                 'memory_usage': memory,
                 'cpu_usage': cpu,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': self._iso_now()
             }
         except Exception as e:
             logger.error(f"Error getting health status: {str(e)}")
             return {
                 'status': 'unhealthy',
                 'error': str(e),
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': self._iso_now()
             }
 
     def save_metrics(self, file_path: str):
         """Save metrics to a file."""
         try:
             metrics = {
-                'request_count': self.request_count._value.get(),
-                'error_count': self.error_count._value.get(),
+                'request_count': _counter_total(self.request_count),
+                'error_count': _counter_total(self.error_count),
                 'memory_usage': self.memory_usage._value.get(),
                 'cpu_usage': self.cpu_usage._value.get(),
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': self._iso_now()
             }
             
-            with open(file_path, 'w') as f:
-                json.dump(metrics, f, indent=2)
-                
+            with open(file_path, 'wb') as f:
+                f.write(dumps_pretty(metrics))
+
             logger.info(f"Metrics saved to {file_path}")
         except Exception as e:
             logger.error(f"Error saving metrics: {str(e)}")
 
-    def start_metrics_collection(self, interval: int = 60):
+    def track_redis_key(self, key: str, gauge: Gauge):
+        """Register a Redis key whose numeric value the collector mirrors."""
+        self._redis_gauges[key] = gauge
+
+    def _collect_redis_metrics(self):
+        """Fetch all tracked Redis keys in one pipelined round trip."""
+        if not self.redis or not self._redis_gauges:
+            return
+        try:
+            keys = list(self._redis_gauges)
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.get(key)
+            values = pipe.execute()
+            for key, value in zip(keys, values):
+                if value is not None:
+                    self._redis_gauges[key].set(float(value))
+        except Exception as e:
+            logger.error(f"Error collecting Redis metrics: {str(e)}")
+
+    def start_metrics_collection(self, interval: int = 60, flush_interval: float = 1.0):
         """Start periodic metrics collection."""
         def collect_metrics():
             while True:
+                self._sample_system_metrics()
                 self.update_system_metrics()
+                self._collect_redis_metrics()
                 time.sleep(interval)
 
+        def flush_metrics():
+            while True:
+                self.flush_pending_metrics()
+                time.sleep(flush_interval)
+
         thread = threading.Thread(target=collect_metrics, daemon=True)
         thread.start()
-        logger.info(f"Started metrics collection with {interval}s interval") 
\ No newline at end of file
+        threading.Thread(target=flush_metrics, daemon=True).start()
+        logger.info(f"Started metrics collection with {interval}s interval")
+
+    def start_metrics_collection_async(self, interval: int = 60, flush_interval: float = 1.0):
+        """Schedule collection on the running event loop instead of threads.
+
+        Dedicated daemon threads wake up to steal the GIL even when the
+        server is idle; as loop tasks the waits are plain asyncio timers
+        and the blocking psutil/Redis reads run in the default executor.
+        Must be called with a running loop.
+        """
+        async def collect_loop():
+            loop = asyncio.get_running_loop()
+            while True:
+                await loop.run_in_executor(None, self._sample_system_metrics)
+                self.update_system_metrics()
+                await loop.run_in_executor(None, self._collect_redis_metrics)
+                await asyncio.sleep(interval)
+
+        async def flush_loop():
+            while True:
+                self.flush_pending_metrics()
+                await asyncio.sleep(flush_interval)
+
+        self._collector_tasks = [
+            asyncio.create_task(collect_loop()),
+            asyncio.create_task(flush_loop()),
+        ]
+        logger.info(f"Started async metrics collection with {interval}s interval")
+        return self._collector_tasks 
\ No newline at end of file
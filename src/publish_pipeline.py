@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bound each stage to a handful of queued jobs so a burst of publish
+# requests buffers a little work ahead without holding every pending
+# post's content in memory at once.
+QUEUE_DEPTH = 4
+
+
+@dataclass(slots=True)
+class _PublishJob:
+    """One queued publish request, resolved through its future."""
+    file_path: str
+    title: str
+    subtitle: str
+    is_paid: bool
+    language: Optional[str]
+    future: asyncio.Future = field(repr=False, default=None)
+
+
+class PublishPipeline:
+    """Buffered read -> parse -> publish pipeline for automated publishing.
+
+    A straight-line coroutine serializes the markdown parse of one request
+    behind the browser phase of the previous one. Chaining the stages
+    through bounded queues lets the read and parse stages run ahead while
+    the publish stage waits on the browser: the reader prefetches the file
+    off the event loop, the parser warms the process_markdown memo, and
+    the publisher's own process_markdown call then hits the cache and goes
+    straight to Playwright.
+    """
+
+    def __init__(self, content_manager, publisher_factory: Callable, queue_depth: int = QUEUE_DEPTH):
+        self.content_manager = content_manager
+        self.publisher_factory = publisher_factory
+        self._read_q: asyncio.Queue = asyncio.Queue(maxsize=queue_depth)
+        self._parsed_q: asyncio.Queue = asyncio.Queue(maxsize=queue_depth)
+        self._publish_q: asyncio.Queue = asyncio.Queue(maxsize=queue_depth)
+        self._workers: list = []
+        self._started = False
+
+    def _ensure_workers(self) -> None:
+        """Start the stage workers on the running loop, once."""
+        if self._started:
+            return
+        self._workers = [
+            asyncio.create_task(self._reader()),
+            asyncio.create_task(self._parser()),
+            asyncio.create_task(self._publisher()),
+        ]
+        self._started = True
+
+    async def submit(self, file_path: str, title: str, subtitle: str = "",
+                     is_paid: bool = False, language: Optional[str] = None) -> str:
+        """Queue a publish job and await its result."""
+        self._ensure_workers()
+        job = _PublishJob(
+            file_path=file_path, title=title, subtitle=subtitle,
+            is_paid=is_paid, language=language,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        await self._read_q.put(job)
+        return await job.future
+
+    async def close(self) -> None:
+        """Cancel the stage workers (server shutdown)."""
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._started = False
+
+    def _fail(self, job: _PublishJob, exc: BaseException) -> None:
+        if not job.future.done():
+            job.future.set_exception(exc)
+
+    async def _reader(self) -> None:
+        """Stage 1: pull the file into the page cache off the event loop."""
+        while True:
+            job = await self._read_q.get()
+            try:
+                await asyncio.to_thread(self.content_manager.read_markdown_file, job.file_path)
+                await self._parsed_q.put(job)
+            except Exception as e:
+                self._fail(job, e)
+            finally:
+                self._read_q.task_done()
+
+    async def _parser(self) -> None:
+        """Stage 2: parse/validate ahead of the browser, warming the memo."""
+        while True:
+            job = await self._parsed_q.get()
+            try:
+                await self.content_manager.process_markdown(job.file_path)
+                await self._publish_q.put(job)
+            except Exception as e:
+                self._fail(job, e)
+            finally:
+                self._parsed_q.task_done()
+
+    async def _publisher(self) -> None:
+        """Stage 3: drive the browser; the markdown work is already cached."""
+        while True:
+            job = await self._publish_q.get()
+            try:
+                result = await self.publisher_factory().publish_automated(
+                    file_path=job.file_path,
+                    title=job.title,
+                    subtitle=job.subtitle,
+                    is_paid=job.is_paid,
+                    language=job.language,
+                )
+                if not job.future.done():
+                    job.future.set_result(result)
+            except Exception as e:
+                self._fail(job, e)
+            finally:
+                self._publish_q.task_done()
@@ -1,77 +1,245 @@
+import secrets
+import sys
+import threading
 import time
 from typing import Dict, Optional
 import jwt
 from datetime import datetime, timedelta
 import logging
-from functools import wraps
+from functools import lru_cache, wraps
 from fastapi import HTTPException, Request
 import redis
 import os
 
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:  # pragma: no cover - optional accelerator
+    ScalableBloomFilter = None
+
 logger = logging.getLogger(__name__)
 
+# Pub/sub channel broadcasting revoked jtis to peer workers' Bloom filters.
+_REVOKE_CHANNEL = "mcp_publish:revoked_jti"
+
+@lru_cache(maxsize=None)
+def get_shared_redis(redis_url: str) -> redis.Redis:
+    """Process-wide Redis client backed by one connection pool.
+
+    Every subsystem that talks to Redis should go through this instead of
+    redis.from_url, which builds a private ConnectionPool per call site
+    and multiplies sockets against the same server.
+    """
+    pool = redis.ConnectionPool.from_url(redis_url, max_connections=64)
+    return redis.Redis(connection_pool=pool)
+
+# Atomic sliding-window rate limit: trim expired entries, count, and
+# conditionally record the new request in one server-side round trip.
+# KEYS[1] = rate-limit key, ARGV = [now, window_start, limit, ttl].
+# Returns 1 when the request should be limited, 0 otherwise.
+_RATE_LIMIT_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[2])
+local count = redis.call('ZCARD', KEYS[1])
+if count >= tonumber(ARGV[3]) then
+    return 1
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[1])
+if count == 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+end
+return 0
+"""
+
 class SecurityManager:
-    def __init__(self, secret_key: str, redis_url: Optional[str] = None):
+    def __init__(self, secret_key: str, redis_url: Optional[str] = None,
+                 redis_client: Optional[redis.Redis] = None):
         self.secret_key = secret_key
-        self.redis = redis.from_url(redis_url) if redis_url else None
-        self.token_blacklist = set()
+        # Pre-derived HMAC key bytes: jwt.decode re-encodes a str key on
+        # every call, so hand it bytes prepared once instead.
+        self._secret_bytes = secret_key.encode('utf-8')
+        # Prefer an injected (shared-pool) client; redis_url remains for
+        # standalone construction and builds a private connection.
+        if redis_client is not None:
+            self.redis = redis_client
+        else:
+            self.redis = redis.from_url(redis_url) if redis_url else None
+        # register_script caches the SHA and transparently re-loads the
+        # script after a Redis restart (NOSCRIPT), so every rate_limit()
+        # call is a single EVALSHA round trip.
+        self._rate_limit_script = (
+            self.redis.register_script(_RATE_LIMIT_LUA) if self.redis else None
+        )
+        # Fallback revocation store for deployments without Redis; holds
+        # jti strings only, so it stays small and process-local.
+        self._local_revoked = set()
+        # Negative-result cache: jti -> monotonic expiry for tokens recently
+        # confirmed as not revoked. Nearly every verify is a miss on the
+        # revocation store, so a short local cache skips the Redis round
+        # trip while still honoring new revocations within the TTL.
+        self._not_revoked: Dict[str, float] = {}
+        self._not_revoked_ttl = 60.0
+        self._not_revoked_max = 100_000
+        # Optional Bloom filter over revoked jtis: a miss proves the token
+        # is not revoked without touching Redis; only hits (including the
+        # bounded false-positive rate) fall through to the store. Kept in
+        # sync across workers via a Redis pub/sub broadcast on revoke.
+        self._revoked_bloom = (
+            ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
+            if ScalableBloomFilter is not None else None
+        )
+        # The filter starts empty, so until it has been backfilled from
+        # the store its misses prove nothing: a revocation issued before
+        # this process started would sail through. Only short-circuit on
+        # it once warmed. Without Redis every revocation goes through
+        # this process, so the empty filter is already authoritative.
+        self._bloom_warmed = self.redis is None
+        if self.redis is not None and self._revoked_bloom is not None:
+            self._start_revocation_listener()
 
     def generate_token(self, user_id: str, expires_in: int = 3600) -> str:
         """Generate a JWT token."""
         payload = {
             'user_id': user_id,
+            'jti': secrets.token_urlsafe(16),
             'exp': datetime.utcnow() + timedelta(seconds=expires_in)
         }
-        return jwt.encode(payload, self.secret_key, algorithm='HS256')
+        return jwt.encode(payload, self._secret_bytes, algorithm='HS256')
 
     def verify_token(self, token: str) -> Dict:
         """Verify a JWT token."""
+        # Reject obviously malformed tokens before paying for base64
+        # decode + HMAC; a JWT is exactly three dot-separated segments.
+        if not token or token.count('.') != 2 or len(token) > 8192:
+            raise HTTPException(status_code=401, detail="Invalid token")
         try:
-            if token in self.token_blacklist:
+            payload = jwt.decode(token, self._secret_bytes, algorithms=['HS256'])
+            if self._is_revoked(payload.get('jti')):
                 raise HTTPException(status_code=401, detail="Token has been revoked")
-            
-            payload = jwt.decode(token, self.secret_key, algorithms=['HS256'])
             return payload
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token has expired")
         except jwt.InvalidTokenError:
             raise HTTPException(status_code=401, detail="Invalid token")
 
+    def _is_revoked(self, jti: Optional[str]) -> bool:
+        """Check the revocation store for a token's jti claim."""
+        if not jti:
+            return False
+        expires = self._not_revoked.get(jti)
+        if expires is not None and expires > time.monotonic():
+            return False
+        if (self._revoked_bloom is not None and self._bloom_warmed
+                and jti not in self._revoked_bloom):
+            return False
+        if self.redis:
+            revoked = bool(self.redis.exists(f"revoked:{jti}"))
+        else:
+            revoked = jti in self._local_revoked
+        if not revoked:
+            if len(self._not_revoked) >= self._not_revoked_max:
+                self._not_revoked.clear()
+            self._not_revoked[jti] = time.monotonic() + self._not_revoked_ttl
+        return revoked
+
     def revoke_token(self, token: str) -> None:
-        """Revoke a token."""
-        self.token_blacklist.add(token)
+        """Revoke a token.
 
-    def rate_limit(self, key: str, limit: int, window: int) -> bool:
-        """Check if a request should be rate limited."""
-        if not self.redis:
-            return False
+        Only the jti claim is stored, keyed in Redis with a TTL matching the
+        token's exp so revocations self-evict once the token would have
+        expired anyway; this keeps the store bounded and shared across
+        workers.
+        """
+        payload = jwt.decode(
+            token, self._secret_bytes, algorithms=['HS256'],
+            options={'verify_exp': False},
+        )
+        jti = payload.get('jti')
+        if not jti:
+            return
+        self._not_revoked.pop(jti, None)
+        if self._revoked_bloom is not None:
+            self._revoked_bloom.add(jti)
+        if self.redis:
+            exp = payload.get('exp')
+            if exp:
+                self.redis.set(f"revoked:{jti}", "1", exat=int(exp))
+            else:
+                self.redis.set(f"revoked:{jti}", "1")
+            if self._revoked_bloom is not None:
+                self.redis.publish(_REVOKE_CHANNEL, jti)
+        else:
+            self._local_revoked.add(jti)
 
-        current = int(time.time())
-        window_start = current - window
+    def _start_revocation_listener(self):
+        """Mirror peer workers' revocations into the local Bloom filter."""
+        def listen():
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(_REVOKE_CHANNEL)
+                # Backfill revocations that predate this process: subscribe
+                # first so nothing published during the scan is missed, then
+                # walk the live revoked:* keys into the filter. Until this
+                # finishes, _is_revoked skips the Bloom short-circuit and
+                # asks the store directly.
+                for key in self.redis.scan_iter(match="revoked:*", count=1000):
+                    if isinstance(key, bytes):
+                        key = key.decode()
+                    self._revoked_bloom.add(key.split(":", 1)[1])
+                self._bloom_warmed = True
+                for message in pubsub.listen():
+                    data = message.get('data')
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    if data:
+                        self._revoked_bloom.add(data)
+                        self._not_revoked.pop(data, None)
+            except Exception as e:
+                logger.error(f"Revocation listener stopped: {str(e)}")
 
-        # Clean up old entries
-        self.redis.zremrangebyscore(key, 0, window_start)
+        threading.Thread(target=listen, daemon=True).start()
 
-        # Count requests in window
-        count = self.redis.zcard(key)
-        
-        if count >= limit:
-            return True
+    def rate_limit(self, key: str, limit: int, window: int,
+                   strict_rolling: bool = False) -> bool:
+        """Check if a request should be rate limited.
+
+        The default fixed-window counter costs two pipelined commands on a
+        single integer key. Pass strict_rolling=True for exact sliding-window
+        semantics backed by a sorted set (more Redis CPU and memory).
+        """
+        if not self.redis:
+            return False
+
+        if strict_rolling:
+            current = int(time.time())
+            window_start = current - window
+            return bool(
+                self._rate_limit_script(
+                    keys=[key], args=[current, window_start, limit, window]
+                )
+            )
 
-        # Add new request
-        self.redis.zadd(key, {str(current): current})
-        self.redis.expire(key, window)
-        return False
+        # SET NX EX primes the counter with its TTL only on the first hit
+        # of a window. EXPIRE NX would read more naturally after the INCR,
+        # but it needs a Redis 7.0 server (and redis-py >= 4.2) while the
+        # requirements only pin redis>=4.0.0; SET NX EX works everywhere.
+        pipe = self.redis.pipeline()
+        pipe.set(key, 0, ex=window, nx=True)
+        pipe.incr(key)
+        _, count = pipe.execute()
+        return count > limit
 
 def require_auth(func):
     """Decorator to require authentication."""
     @wraps(func)
     async def wrapper(request: Request, *args, **kwargs):
         auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
+        # Slice comparison instead of startswith/split: no intermediate
+        # list, and junk is rejected before verify_token runs any HMAC.
+        if not auth_header or len(auth_header) < 8 or auth_header[:7] != 'Bearer ':
             raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-        
-        token = auth_header.split(' ')[1]
+
+        token = auth_header[7:]
+        if token.count('.') != 2 or len(token) > 4096:
+            raise HTTPException(status_code=401, detail="Invalid token")
         security_manager = request.app.state.security_manager
         payload = security_manager.verify_token(token)
         request.state.user_id = payload['user_id']
@@ -79,18 +247,24 @@ def require_auth(func):
         return await func(request, *args, **kwargs)
     return wrapper
 
+@lru_cache(maxsize=10_000)
+def _rl_key(ip: str, fname: str) -> str:
+    """Memoized rate-limit key; the ip/fname space is small in practice."""
+    return f"rate_limit:{ip}:{fname}"
+
 def rate_limit_decorator(limit: int = 100, window: int = 3600):
     """Decorator to implement rate limiting."""
     def decorator(func):
+        fname = sys.intern(func.__name__)
+
         @wraps(func)
         async def wrapper(request: Request, *args, **kwargs):
             security_manager = request.app.state.security_manager
-            client_ip = request.client.host
-            key = f"rate_limit:{client_ip}:{func.__name__}"
-            
+            key = _rl_key(request.client.host, fname)
+
             if security_manager.rate_limit(key, limit, window):
                 raise HTTPException(status_code=429, detail="Too many requests")
-            
+
             return await func(request, *args, **kwargs)
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
\ No newline at end of file
@@ -1,8 +1,14 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import DEFAULT, patch, AsyncMock, MagicMock
 import os
+import re
 import tempfile
 import yaml # Import yaml for frontmatter testing
+try:
+    # LibYAML C bindings parse multiples faster than the pure-Python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 from pathlib import Path # Import Path for file path manipulation
 import jwt # Import jwt for token testing
 from datetime import datetime, timedelta # Import datetime and timedelta for token testing
@@ -11,20 +17,32 @@ import redis # Import redis for rate limiting tests
 import aiohttp # Import aiohttp for asynchronous testing
 import asyncio # Import asyncio for running async tests
 
+from functools import lru_cache
+
+from prometheus_client import CollectorRegistry
+
 from src.content_manager import ContentManager # Import ContentManager
+from src.monitoring import MonitoringManager # Import MonitoringManager
 from src.security import SecurityManager # Import SecurityManager
 from src.exceptions import PublishingError, ContentValidationError, APIError # Import specific exceptions
-from mcp_publish_server import make_api_request # Keep make_api_request for now, will move later
 
-class TestContentManager(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory and markdown file
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.temp_file_path = Path(self.temp_dir.name) / "test_article.md"
-        self.empty_file_path = Path(self.temp_dir.name) / "empty_file.md"
-        self.non_md_file_path = Path(self.temp_dir.name) / "test.txt"
+@lru_cache(maxsize=None)
+def _cached_parse(content):
+    """Memoized frontmatter parse for constant fixture strings."""
+    return ContentManager().parse_frontmatter(content)
 
-        self.valid_content = """---
+class TestContentManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The fixture files are read-only across tests, so the temp dir and
+        # its three files are materialized once per class instead of being
+        # rewritten (and unlinked) for every test.
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.temp_file_path = Path(cls.temp_dir.name) / "test_article.md"
+        cls.empty_file_path = Path(cls.temp_dir.name) / "empty_file.md"
+        cls.non_md_file_path = Path(cls.temp_dir.name) / "test.txt"
+
+        cls.valid_content = """---
 title: Test Title
 subtitle: Test Subtitle
 tags: [test, markdown]
@@ -35,20 +53,37 @@ language: en
 
 Some content here.
 """
-        with open(self.temp_file_path, "w", encoding="utf-8") as f:
-            f.write(self.valid_content)
+        with open(cls.temp_file_path, "w", encoding="utf-8") as f:
+            f.write(cls.valid_content)
 
-        with open(self.empty_file_path, "w", encoding="utf-8") as f:
+        with open(cls.empty_file_path, "w", encoding="utf-8") as f:
             f.write("")
-            
-        with open(self.non_md_file_path, "w", encoding="utf-8") as f:
-            f.write("Just plain text.")
 
-        self.content_manager = ContentManager() # Initialize ContentManager
+        with open(cls.non_md_file_path, "w", encoding="utf-8") as f:
+            f.write("Just plain text.")
 
-    def tearDown(self):
+        # Parse the constant fixture's YAML once; tests assert against
+        # these instead of re-running yaml per assertion.
+        cls.expected_frontmatter = yaml.load(
+            "title: Test Title\nsubtitle: Test Subtitle\ntags: [test, markdown]\nlanguage: en\n",
+            Loader=SafeLoader,
+        )
+        cls.expected_body = "\n# This is a test article\n\nSome content here.\n"
+
+        # Over-limit stress strings built once; the limits come from a
+        # throwaway manager so they track the configured maxima.
+        cm = ContentManager()
+        cls._too_long_title = "a" * (cm.max_title_length + 1)
+        cls._too_long_subtitle = "a" * (cm.max_subtitle_length + 1)
+
+    @classmethod
+    def tearDownClass(cls):
         # Clean up the temporary directory
-        self.temp_dir.cleanup()
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        # Fresh manager per test: its memo caches must not leak between tests
+        self.content_manager = ContentManager() # Initialize ContentManager
 
     def test_validate_file_path(self):
         # Test valid file path
@@ -62,40 +97,27 @@ Some content here.
         with self.assertRaises(ValueError): # Expect ValueError from ContentManager
             self.content_manager.validate_file_path(self.non_md_file_path)
 
-    def test_validate_title(self):
-        # Test valid title
-        self.content_manager.validate_title("Valid Title")
-
-        # Test empty title
-        with self.assertRaises(ValueError): # Expect ValueError from ContentManager
-            self.content_manager.validate_title("")
-
-        # Test too long title (using default max_title_length from ContentManager)
-        with self.assertRaises(ValueError): # Expect ValueError from ContentManager
-            self.content_manager.validate_title("a" * (self.content_manager.max_title_length + 1))
-
-    def test_validate_subtitle(self):
-        # Test valid subtitle
-        self.content_manager.validate_subtitle("Valid Subtitle")
-
-        # Test empty subtitle (should pass)
-        self.content_manager.validate_subtitle("")
-
-        # Test too long subtitle (using default max_subtitle_length from ContentManager)
-        with self.assertRaises(ValueError): # Expect ValueError from ContentManager
-            self.content_manager.validate_subtitle("a" * (self.content_manager.max_subtitle_length + 1))
-
-    def test_validate_tags(self):
-        # Test valid tags
-        self.content_manager.validate_tags(["python", "tech", "coding"])
-
-        # Test too many tags (using default max_tags from ContentManager)
-        with self.assertRaises(ValueError): # Expect ValueError from ContentManager
-            self.content_manager.validate_tags(["tag1", "tag2", "tag3", "tag4", "tag5", "tag6"])
-
-        # Test invalid tag format
-        with self.assertRaises(ValueError): # Expect ValueError from ContentManager
-            self.content_manager.validate_tags(["invalid tag!"])
+    def test_validate_title_subtitle_tags(self):
+        # Table-driven: one test frame, one manager, subTest per case.
+        cases = [
+            ('validate_title', "Valid Title", None),
+            ('validate_title', "", r"Title cannot be empty"),
+            ('validate_title', self._too_long_title, r"Title exceeds maximum length"),
+            ('validate_subtitle', "Valid Subtitle", None),
+            ('validate_subtitle', "", None),  # empty subtitle is allowed
+            ('validate_subtitle', self._too_long_subtitle, r"Subtitle exceeds maximum length"),
+            ('validate_tags', ["python", "tech", "coding"], None),
+            ('validate_tags', ["tag1", "tag2", "tag3", "tag4", "tag5", "tag6"], r"Maximum \d+ tags allowed"),
+            ('validate_tags', ["invalid tag!"], r"Invalid tag format"),
+        ]
+        for method, value, message in cases:
+            with self.subTest(method=method, value=value):
+                validator = getattr(self.content_manager, method)
+                if message is None:
+                    validator(value)
+                else:
+                    with self.assertRaisesRegex(ValueError, message):
+                        validator(value)
 
     def test_read_markdown_file(self):
         # Test valid file
@@ -109,10 +131,10 @@ Some content here.
             self.content_manager.read_markdown_file(self.empty_file_path)
 
     def test_parse_frontmatter(self):
-        frontmatter, content = self.content_manager.parse_frontmatter(self.valid_content)
-        self.assertEqual(frontmatter['title'], 'Test Title')
-        self.assertEqual(frontmatter['tags'], ['test', 'markdown'])
-        self.assertEqual(content.strip(), "# This is a test article\n\nSome content here.")
+        frontmatter, content = _cached_parse(self.valid_content)
+        self.assertEqual(frontmatter['title'], self.expected_frontmatter['title'])
+        self.assertEqual(frontmatter['tags'], self.expected_frontmatter['tags'])
+        self.assertEqual(content.strip(), self.expected_body.strip())
 
         # Test content without frontmatter
         no_frontmatter_content = "# Just a title\nSome content."
@@ -121,16 +143,28 @@ Some content here.
         self.assertEqual(content, no_frontmatter_content)
 
     def test_validate_language(self):
-        self.assertEqual(self.content_manager.validate_language("en-US"), "en")
-        self.assertEqual(self.content_manager.validate_language("fr"), "fr")
-        self.assertEqual(self.content_manager.validate_language("unsupported"), self.content_manager.default_language)
-        self.assertEqual(self.content_manager.validate_language(None), self.content_manager.default_language)
+        # The stock settings only support "en"; widen them so the "fr"
+        # case exercises acceptance rather than the default fallback.
+        from dataclasses import replace
+        from config import get_settings
+
+        manager = ContentManager(replace(get_settings(), SUPPORTED_LANGUAGES=("en", "fr")))
+        default = manager.default_language
+        for value, expected in [("en-US", "en"), ("fr", "fr"),
+                                ("unsupported", default), (None, default)]:
+            with self.subTest(value=value):
+                self.assertEqual(manager.validate_language(value), expected)
 
     def test_validate_frontmatter(self):
         valid_fm = {'title': 'Valid', 'tags': ['a'], 'language': 'en'}
-        self.assertEqual(self.content_manager.validate_frontmatter(valid_fm), valid_fm)
-
-        invalid_fm_title = {'title': 'a' * (self.content_manager.max_title_length + 1)}
+        # Tags come back interned and frozen as a tuple; everything else
+        # passes through unchanged.
+        self.assertEqual(
+            self.content_manager.validate_frontmatter(valid_fm),
+            {'title': 'Valid', 'tags': ('a',), 'language': 'en'},
+        )
+
+        invalid_fm_title = {'title': self._too_long_title}
         with self.assertRaises(ValueError):
             self.content_manager.validate_frontmatter(invalid_fm_title)
 
@@ -142,79 +176,73 @@ Some content here.
         with self.assertRaises(ValueError):
             self.content_manager.validate_frontmatter(invalid_fm_tag_format)
 
-    @patch('aiohttp.ClientSession')
-    @patch('content_manager.Path')
-    @patch('builtins.open', new_callable=MagicMock)
-    async def test_process_images(self, mock_open, mock_path, mock_client_session):
-        # Mock aiohttp.ClientSession and its methods
+    # Minimal valid PNG signature so the magic-byte sniff accepts the stub
+    _PNG_BYTES = b'\x89PNG\r\n\x1a\n' + b'\x00' * 16
+
+    def test_process_images(self):
+        # Stub at the session layer (the stable seam _get_session hands
+        # out) instead of the connector: connector-level interception is
+        # coupled to aiohttp internals that shift between releases.
+        upload_url = "http://uploads.test/upload"
+        remote_image = "http://example.com/remote_image.jpg"
+
+        async def _png_chunks(size):
+            yield self._PNG_BYTES
+
+        get_response = MagicMock()
+        get_response.raise_for_status.return_value = None
+        get_response.headers = {}
+        get_response.content.iter_chunked = _png_chunks
+
+        post_response = MagicMock()
+        post_response.raise_for_status.return_value = None
+        post_response.json = AsyncMock(return_value={'url': 'http://uploaded.com/image.png'})
+
         mock_session = MagicMock()
-        mock_client_session.return_value.__aenter__.return_value = mock_session
-
-        # Mock successful GET response for remote image
-        mock_get_response = MagicMock()
-        mock_get_response.read.return_value = b'fakeimagedata'
-        mock_get_response.raise_for_status.return_value = None
-        mock_session.get.return_value.__aenter__.return_value = mock_get_response
-
-        # Mock successful POST response for image upload
-        mock_post_response = MagicMock()
-        mock_post_response.json.return_value = {'url': 'http://uploaded.com/image.png'}
-        mock_post_response.raise_for_status.return_value = None
-        mock_session.post.return_value.__aenter__.return_value = mock_post_response
-
-        # Mock Path.resolve() for local images
-        mock_path_instance = MagicMock()
-        mock_path.return_value.resolve.return_value = mock_path_instance
-
-        # Mock open for reading local images
-        mock_file = MagicMock()
-        mock_file.read.return_value = b'fakeimagedata'
-        mock_open.return_value.__enter__.return_value = mock_file
-
-        # Test with local image
-        content_with_local_image = "![alt text](local_image.png)"
-        processed_content = await self.content_manager.process_images(content_with_local_image, upload_images=True)
-        self.assertIn("http://uploaded.com/image.png", processed_content)
-        mock_open.assert_called_once_with(mock_path_instance, 'rb')
+        mock_session.closed = False
+        mock_session.close = AsyncMock()
+        mock_session.get.return_value.__aenter__.return_value = get_response
+        mock_session.post.return_value.__aenter__.return_value = post_response
+
+        async def run():
+            cm = ContentManager(image_upload_url=upload_url)
+            cm._session = mock_session
+            try:
+                uploaded = await cm.process_images(
+                    f"![alt text]({remote_image})", upload_images=True
+                )
+                unchanged = await cm.process_images("![alt text](image.png)", upload_images=False)
+                return uploaded, unchanged
+            finally:
+                await cm.aclose()
+
+        uploaded, unchanged = asyncio.run(run())
+        self.assertIn("http://uploaded.com/image.png", uploaded)
+        mock_session.get.assert_called_once_with(remote_image)
         mock_session.post.assert_called_once()
-        mock_open.reset_mock()
-        mock_session.post.reset_mock()
-
-        # Test with remote image
-        content_with_remote_image = "![alt text](http://example.com/remote_image.jpg)"
-        processed_content = await self.content_manager.process_images(content_with_remote_image, upload_images=True)
-        self.assertIn("http://uploaded.com/image.png", processed_content)
-        mock_session.get.assert_called_once_with("http://example.com/remote_image.jpg")
-        mock_session.post.assert_called_once()
-        mock_session.get.reset_mock()
-        mock_session.post.reset_mock()
-
-        # Test without upload
-        content_with_image = "![alt text](image.png)"
-        processed_content = await self.content_manager.process_images(content_with_image, upload_images=False)
-        self.assertEqual(processed_content, content_with_image)
-        mock_session.get.assert_not_called()
-        mock_session.post.assert_not_called()
+        self.assertEqual(unchanged, "![alt text](image.png)")
 
     def test_validate_content(self):
-        # Test valid content
-        valid_content = "# Title\nSome content that is long enough."
-        self.assertTrue(self.content_manager.validate_content(valid_content))
+        # Test valid content (link-free, so no network is touched)
+        valid_content = "# Title\nSome content that is long enough to pass validation."
+        self.assertTrue(asyncio.run(self.content_manager.validate_content(valid_content)))
 
         # Test content too short
         short_content = "# Title\nShort."
-        self.assertFalse(self.content_manager.validate_content(short_content))
+        self.assertFalse(asyncio.run(self.content_manager.validate_content(short_content)))
 
         # Test content missing main heading
-        no_heading_content = "Some content."
-        self.assertFalse(self.content_manager.validate_content(no_heading_content))
-
-    @patch('aiohttp.ClientSession')
-    @patch('content_manager.logger')
-    def test_validate_content_broken_links(self, mock_logger, mock_client_session):
-        # Mock aiohttp.ClientSession and its get method
+        no_heading_content = "Some content that is long enough but has no main heading."
+        self.assertFalse(asyncio.run(self.content_manager.validate_content(no_heading_content)))
+
+    @patch('src.content_manager.logger')
+    def test_validate_content_broken_links(self, mock_logger):
+        # Stub at the session layer: validate_content only ever calls
+        # head() on the shared session, so a MagicMock (whose __aenter__
+        # is async automatically) stands in for the whole request path.
         mock_session = MagicMock()
-        mock_client_session.return_value.__aenter__.return_value = mock_session
+        mock_session.closed = False
+        self.content_manager._session = mock_session
 
         # Test with valid links
         valid_content_with_links = "# Title\n\nCheck out [Google](http://google.com) and [Bing](http://bing.com)."
@@ -229,13 +257,17 @@ Some content here.
         mock_logger.warning.reset_mock()
 
         # Test with a broken link
-        broken_content_with_links = "# Title\n\nCheck out [Broken](http://broken.link)."
+        broken_content_with_links = "# Title\n\nCheck out this [Broken](http://broken.link) resource."
         mock_response_404 = MagicMock()
         mock_response_404.raise_for_status.side_effect = aiohttp.ClientError("Not Found") # Simulate broken link
         mock_session.head.return_value.__aenter__.return_value = mock_response_404
 
         self.assertFalse(asyncio.run(self.content_manager.validate_content(broken_content_with_links)))
-        mock_session.head.assert_called_once_with("http://broken.link", allow_redirects=True, timeout=5)
+        mock_session.head.assert_called_once_with(
+            "http://broken.link",
+            allow_redirects=True,
+            timeout=aiohttp.ClientTimeout(total=5, connect=2),
+        )
         mock_logger.warning.assert_called_once_with("Broken link found: http://broken.link - Not Found")
 
     def test_generate_social_media_message_truncation(self):
@@ -243,27 +275,30 @@ Some content here.
         medium_link = "http://medium.com/article"
         substack_link = "http://substack.com/article"
 
-        # Test without truncation
+        # Test without truncation: title, hashtags and links all intact
         message = self.content_manager.generate_social_media_message(frontmatter, medium_link, substack_link)
-        self.assertIn("Just published a new article: 'A Very Long Article Title That Needs Truncation'.", message)
+        self.assertTrue(message.startswith('A Very Long Article Title That Needs Truncation'))
         self.assertIn("#test #longtag", message)
         self.assertIn(f"\n\nRead it on Medium: {medium_link}\nRead it on Substack: {substack_link}", message)
 
-        # Test with truncation
+        # Test with truncation: the links survive untouched, the content
+        # is ellipsized, and the hashtags are the first thing dropped.
         max_length = 100
         truncated_message = self.content_manager.generate_social_media_message(frontmatter, medium_link, substack_link, max_length=max_length)
         self.assertTrue(len(truncated_message) <= max_length)
         self.assertIn("...", truncated_message)
+        self.assertNotIn("#test", truncated_message)
         self.assertIn(f"\n\nRead it on Medium: {medium_link}\nRead it on Substack: {substack_link}", truncated_message)
 
-        # Test truncation with summary
+        # Test with summary: it replaces the title, and hashtags stay
+        # when the budget allows
         frontmatter_with_summary = {'title': 'A Very Long Article Title That Needs Truncation', 'summary': 'This is a short summary.', 'tags': ['test', 'longtag']}
-        message_with_summary = self.content_manager.generate_social_media_message(frontmatter_with_summary, medium_link, substack_link, max_length=max_length)
-        self.assertTrue(len(message_with_summary) <= max_length)
-        self.assertIn("This is a short summary.", message_with_summary)
-        self.assertIn(f"\n\nRead it on Medium: {medium_link}\nRead it on Substack: {substack_link}", message_with_summary)
-        # Check if hashtags are included if they fit after summary
+        message_with_summary = self.content_manager.generate_social_media_message(frontmatter_with_summary, medium_link, substack_link, max_length=280)
+        self.assertTrue(len(message_with_summary) <= 280)
+        self.assertTrue(message_with_summary.startswith('This is a short summary.'))
+        self.assertNotIn('A Very Long Article Title', message_with_summary)
         self.assertIn("#test #longtag", message_with_summary)
+        self.assertIn(f"\n\nRead it on Medium: {medium_link}\nRead it on Substack: {substack_link}", message_with_summary)
 
 
     def test_sanitize_content(self):
@@ -277,108 +312,170 @@ Some content here.
         sanitized_content = self.content_manager.sanitize_content(whitespace_content)
         self.assertEqual(sanitized_content, "Line1\n\nLine2\n\nLine3")
 
-    @patch('content_manager.ContentManager.read_markdown_file')
-    @patch('content_manager.ContentManager.parse_frontmatter')
-    @patch('content_manager.ContentManager.validate_frontmatter')
-    @patch('content_manager.ContentManager.sanitize_content')
-    @patch('content_manager.ContentManager.process_images')
-    @patch('content_manager.ContentManager.validate_content')
-    def test_process_markdown(self, mock_validate_content, mock_process_images, mock_sanitize_content, mock_validate_frontmatter, mock_parse_frontmatter, mock_read_markdown_file):
-        mock_read_markdown_file.return_value = self.valid_content
-        mock_parse_frontmatter.return_value = ({'title': 'Test'}, "content")
-        mock_validate_frontmatter.return_value = {'title': 'Test'}
-        mock_sanitize_content.return_value = "sanitized content"
-        mock_process_images.return_value = "processed content"
-        mock_validate_content.return_value = True
-
-        frontmatter, content = self.content_manager.process_markdown(self.temp_file_path)
-
-        mock_read_markdown_file.assert_called_once_with(self.temp_file_path)
-        mock_parse_frontmatter.assert_called_once_with(self.valid_content)
-        mock_validate_frontmatter.assert_called_once_with({'title': 'Test'})
-        mock_sanitize_content.assert_called_once_with("content")
-        mock_process_images.assert_called_once_with("sanitized content", upload_images=True)
-        mock_validate_content.assert_called_once_with("processed content")
-
-        self.assertEqual(frontmatter, {'title': 'Test'})
-        self.assertEqual(content, "processed content")
-
-        # Test with upload_images=False
-        mock_process_images.reset_mock()
-        self.content_manager.process_markdown(self.temp_file_path, upload_images=False)
-        mock_process_images.assert_called_once_with("sanitized content", upload_images=False)
+    def test_process_markdown(self):
+        # One patch.multiple instead of a stack of eight decorators: the
+        # mock machinery installs/uninstalls once. Path validation is
+        # mocked out too, so the test consumes only the in-memory fixture
+        # string, never the on-disk files. The async stages get AsyncMocks
+        # automatically, and the coroutine runs under asyncio.run.
+        with patch.multiple(
+            'src.content_manager.ContentManager',
+            validate_file_path=DEFAULT,
+            read_markdown_file=DEFAULT,
+            parse_frontmatter=DEFAULT,
+            validate_frontmatter=DEFAULT,
+            sanitize_content=DEFAULT,
+            process_images=DEFAULT,
+            _tokenize=DEFAULT,
+            validate_content=DEFAULT,
+        ) as mocks:
+            mocks['read_markdown_file'].return_value = self.valid_content
+            mocks['parse_frontmatter'].return_value = ({'title': 'Test'}, "content")
+            mocks['validate_frontmatter'].return_value = {'title': 'Test'}
+            mocks['sanitize_content'].return_value = "sanitized content"
+            mocks['process_images'].return_value = "processed content"
+            mocks['_tokenize'].return_value = []
+            mocks['validate_content'].return_value = True
+
+            frontmatter, content = asyncio.run(
+                self.content_manager.process_markdown(self.temp_file_path)
+            )
+
+            mocks['read_markdown_file'].assert_called_once_with(self.temp_file_path)
+            mocks['parse_frontmatter'].assert_called_once_with(self.valid_content)
+            mocks['validate_frontmatter'].assert_called_once_with({'title': 'Test'})
+            mocks['sanitize_content'].assert_called_once_with("content")
+            mocks['process_images'].assert_awaited_once_with("sanitized content")
+            mocks['validate_content'].assert_awaited_once_with("processed content", tokens=[])
+
+            self.assertEqual(frontmatter, {'title': 'Test'})
+            self.assertEqual(content, "processed content")
+
+            # With upload_images=False the image stage is skipped entirely
+            mocks['process_images'].reset_mock()
+            asyncio.run(
+                self.content_manager.process_markdown(self.temp_file_path, upload_images=False)
+            )
+            mocks['process_images'].assert_not_called()
+
+    def test_process_markdown_is_coroutine(self):
+        # Guards against a legacy sync definition shadowing the async one
+        self.assertTrue(asyncio.iscoroutinefunction(ContentManager.process_markdown))
+
+    def test_patterns_precompiled_at_module_scope(self):
+        # Guards against regressions that move re.compile back into the
+        # per-call path of sanitize_content / process_images.
+        from src import content_manager as content_manager_module
+        self.assertIsInstance(content_manager_module._SANITIZE_RE, re.Pattern)
+        self.assertIsInstance(content_manager_module._IMAGE_RE, re.Pattern)
+        # Tag validation uses a module-level str.translate deletion table
+        self.assertIsInstance(content_manager_module._TAG_DEL, dict)
 
 
 class TestMonitoringManager(unittest.TestCase):
-    @patch('monitoring.start_http_server')
-    @patch('monitoring.threading.Thread')
-    def test_init(self, mock_thread, mock_start_http_server):
-        manager = MonitoringManager(metrics_port=9091)
+    FROZEN_TS = "2024-01-01T00:00:00"
+
+    @classmethod
+    def setUpClass(cls):
+        # One class-scoped datetime patch instead of a per-test decorator;
+        # every test sees the same frozen ISO timestamp.
+        cls._datetime_patcher = patch('src.monitoring.datetime')
+        mock_datetime = cls._datetime_patcher.start()
+        mock_datetime.utcfromtimestamp.return_value.isoformat.return_value = cls.FROZEN_TS
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._datetime_patcher.stop()
+
+    @staticmethod
+    def _counter_total(counter):
+        # Labelled counters expose one _total sample per child (plus
+        # _created bookkeeping); sum the children into one scalar.
+        return sum(s.value for s in counter.collect()[0].samples
+                   if s.name.endswith('_total'))
+
+    def _make_manager(self, **kwargs):
+        # Fresh registry per manager: re-registering the same metric names
+        # in the global default registry raises on the second construction,
+        # and collect() walks a tiny registry instead of an accumulating one.
+        # Server startup is opt-in so only the startup tests pay for it.
+        kwargs.setdefault('start_background', False)
+        return MonitoringManager(registry=CollectorRegistry(), **kwargs)
+
+    @patch('src.monitoring.start_http_server')
+    def test_init(self, mock_start_http_server):
+        # start_background only brings up the metrics endpoint; the
+        # collection threads are started separately (and tested below).
+        manager = self._make_manager(metrics_port=9091, start_background=True)
         self.assertEqual(manager.metrics_port, 9091)
         mock_start_http_server.assert_called_once_with(9091)
-        mock_thread.assert_called_once()
-        mock_thread.return_value.start.assert_called_once()
 
-    @patch('monitoring.start_http_server')
+    @patch('src.monitoring.start_http_server')
     def test_start_metrics_server_success(self, mock_start_http_server):
-        manager = MonitoringManager(metrics_port=9092)
+        manager = self._make_manager(metrics_port=9092, start_background=True)
         mock_start_http_server.assert_called_once_with(9092)
 
-    @patch('monitoring.start_http_server')
+    @patch('src.monitoring.start_http_server')
     def test_start_metrics_server_failure(self, mock_start_http_server):
         mock_start_http_server.side_effect = Exception("Server error")
-        with patch('monitoring.logger.error') as mock_logger_error:
-            manager = MonitoringManager(metrics_port=9093)
+        with patch('src.monitoring.logger.error') as mock_logger_error:
+            manager = self._make_manager(metrics_port=9093, start_background=True)
             mock_logger_error.assert_called_once_with("Failed to start metrics server: Server error")
 
-    @patch('monitoring.psutil.Process')
+    @patch('src.monitoring.psutil.Process')
     def test_update_system_metrics(self, mock_process):
         mock_process_instance = MagicMock()
         mock_process.return_value = mock_process_instance
         mock_process_instance.memory_info.return_value.rss = 1000
-        with patch('monitoring.psutil.cpu_percent') as mock_cpu_percent:
+        with patch('src.monitoring.psutil.cpu_percent') as mock_cpu_percent:
             mock_cpu_percent.return_value = 50.0
-            manager = MonitoringManager()
+            manager = self._make_manager()
+            manager._sample_system_metrics()
             manager.update_system_metrics()
             self.assertEqual(manager.memory_usage._value.get(), 1000)
             self.assertEqual(manager.cpu_usage._value.get(), 50.0)
             mock_process.assert_called_once()
-            mock_cpu_percent.assert_called_once()
 
     def test_record_request(self):
-        manager = MonitoringManager()
+        manager = self._make_manager()
         manager.record_request("test_endpoint")
-        self.assertEqual(manager.request_count.collect()[0].samples[0].value, 1.0)
+        manager.flush_pending_metrics()
+        self.assertEqual(self._counter_total(manager.request_count), 1.0)
         manager.record_request("another_endpoint")
-        self.assertEqual(manager.request_count.collect()[0].samples[0].value, 2.0) # Counter is global
+        manager.flush_pending_metrics()
+        self.assertEqual(self._counter_total(manager.request_count), 2.0) # Total across endpoints
 
     def test_record_error(self):
-        manager = MonitoringManager()
+        manager = self._make_manager()
         manager.record_error("test_endpoint", "TestError")
-        self.assertEqual(manager.error_count.collect()[0].samples[0].value, 1.0)
+        manager.flush_pending_metrics()
+        self.assertEqual(self._counter_total(manager.error_count), 1.0)
         manager.record_error("test_endpoint", "AnotherError")
-        self.assertEqual(manager.error_count.collect()[0].samples[0].value, 2.0) # Counter is global
+        manager.flush_pending_metrics()
+        self.assertEqual(self._counter_total(manager.error_count), 2.0) # Total across error types
 
     def test_record_publish_latency(self):
-        manager = MonitoringManager()
+        manager = self._make_manager()
         manager.record_publish_latency("medium", 0.5)
-        self.assertEqual(manager.publish_latency.collect()[0].samples[0].labelvalues, ('medium',))
-        self.assertEqual(manager.publish_latency.collect()[0].samples[-2].value, 1.0) # Check sum
-
-    @patch('monitoring.psutil.Process')
-    @patch('monitoring.psutil.cpu_percent')
-    @patch('monitoring.time.time')
-    @patch('monitoring.datetime')
-    def test_get_health_status_healthy(self, mock_datetime, mock_time, mock_cpu_percent, mock_process):
+        manager.flush_pending_metrics()
+        samples = manager.publish_latency.collect()[0].samples
+        self.assertEqual(samples[0].labels['platform'], 'medium')
+        self.assertEqual(samples[-2].value, 1.0) # _count
+        self.assertEqual(samples[-1].value, 0.5) # _sum
+
+    @patch('src.monitoring.psutil.Process')
+    @patch('src.monitoring.psutil.cpu_percent')
+    @patch('src.monitoring.time.time')
+    def test_get_health_status_healthy(self, mock_time, mock_cpu_percent, mock_process):
         mock_time.return_value = 100.0
         mock_cpu_percent.return_value = 25.0
         mock_process_instance = MagicMock()
         mock_process.return_value = mock_process_instance
         mock_process_instance.memory_info.return_value.rss = 2000
-        mock_datetime.utcnow.return_value.isoformat.return_value = "timestamp"
 
-        manager = MonitoringManager()
+        manager = self._make_manager()
         manager.start_time = 50.0 # Set a start time for uptime calculation
+        manager._sample_system_metrics()
 
         status = manager.get_health_status()
 
@@ -386,70 +483,94 @@ class TestMonitoringManager(unittest.TestCase):
         self.assertEqual(status['uptime'], 50.0)
         self.assertEqual(status['memory_usage'], 2000)
         self.assertEqual(status['cpu_usage'], 25.0)
-        self.assertEqual(status['timestamp'], "timestamp")
+        self.assertEqual(status['timestamp'], self.FROZEN_TS)
 
-    @patch('monitoring.psutil.Process')
-    def test_get_health_status_unhealthy(self, mock_process):
-        mock_process.side_effect = Exception("Health check error")
-        with patch('monitoring.logger.error') as mock_logger_error:
-            manager = MonitoringManager()
+    def test_get_health_status_unhealthy(self):
+        manager = self._make_manager()
+        with patch('src.monitoring.time.time', side_effect=[Exception("Health check error"), 100.0]), \
+             patch('src.monitoring.logger.error') as mock_logger_error:
             status = manager.get_health_status()
             self.assertEqual(status['status'], 'unhealthy')
             self.assertIn('error', status)
             mock_logger_error.assert_called_once_with("Error getting health status: Health check error")
 
-    @patch('builtins.open', new_callable=MagicMock)
-    @patch('monitoring.json.dump')
-    def test_save_metrics(self, mock_json_dump, mock_open):
-        manager = MonitoringManager()
-        manager.request_count.inc()
-        manager.error_count.inc()
+    @patch('src.monitoring.dumps_pretty')
+    def test_save_metrics(self, mock_dumps_pretty):
+        # Construct the manager before patching open: the constructor's
+        # cpu_percent priming reads /proc, which a blanket open patch
+        # would break.
+        manager = self._make_manager()
+        manager.request_count.labels(endpoint="test_endpoint").inc()
+        manager.error_count.labels(endpoint="test_endpoint", error_type="TestError").inc()
         manager.memory_usage.set(1000)
         manager.cpu_usage.set(50.0)
 
-        with patch('monitoring.datetime') as mock_datetime:
-            mock_datetime.utcnow.return_value.isoformat.return_value = "timestamp"
+        with patch('builtins.open', new_callable=MagicMock) as mock_open:
             manager.save_metrics("metrics.json")
 
-            mock_open.assert_called_once_with("metrics.json", 'w')
-            mock_json_dump.assert_called_once()
-            # Check if dump was called with expected data (approximately)
-            args, kwargs = mock_json_dump.call_args
-            metrics_data = args[0]
-            self.assertIn('request_count', metrics_data)
-            self.assertIn('error_count', metrics_data)
-            self.assertIn('memory_usage', metrics_data)
-            self.assertIn('cpu_usage', metrics_data)
-            self.assertEqual(metrics_data['timestamp'], "timestamp")
-
-    @patch('monitoring.threading.Thread')
+        mock_open.assert_called_once_with("metrics.json", 'wb')
+        mock_dumps_pretty.assert_called_once()
+        # Check if dump was called with expected data (approximately)
+        args, kwargs = mock_dumps_pretty.call_args
+        metrics_data = args[0]
+        self.assertIn('request_count', metrics_data)
+        self.assertIn('error_count', metrics_data)
+        self.assertIn('memory_usage', metrics_data)
+        self.assertIn('cpu_usage', metrics_data)
+        self.assertEqual(metrics_data['timestamp'], self.FROZEN_TS)
+
+    @patch('src.monitoring.threading.Thread')
     def test_start_metrics_collection(self, mock_thread):
-        manager = MonitoringManager()
+        manager = self._make_manager()
         manager.start_metrics_collection(interval=10)
-        mock_thread.assert_called_once_with(target=manager.update_system_metrics, daemon=True) # Target should be update_system_metrics
-        mock_thread.return_value.start.assert_called_once()
+        # One collector thread plus one flush thread, both daemonized
+        self.assertEqual(mock_thread.call_count, 2)
+        for call in mock_thread.call_args_list:
+            self.assertTrue(call.kwargs['daemon'])
+        self.assertEqual(mock_thread.return_value.start.call_count, 2)
 
 
 class TestSecurityManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Shared manager and pre-signed token for the non-mutating tests;
+        # HMAC signing is compute-bound, so amortize it across the class.
+        cls.secret_key = "test_secret_key"
+        # Pre-derived key bytes, mirroring SecurityManager._secret_bytes:
+        # decoding with a str key re-encodes it per call.
+        cls.secret_bytes = cls.secret_key.encode('utf-8')
+        cls.shared_manager = SecurityManager(secret_key=cls.secret_key, redis_url=None)
+        cls.valid_token = cls.shared_manager.generate_token("test_user")
+
+        # One class-scoped redis.from_url patch and one Redis-backed
+        # manager shared by the rate-limit tests; each test resets the
+        # mock client instead of rebuilding the manager.
+        cls._redis_patcher = patch('src.security.redis.from_url')
+        cls._mock_from_url = cls._redis_patcher.start()
+        cls.mock_redis_client = MagicMock()
+        cls._mock_from_url.return_value = cls.mock_redis_client
+        cls.security_manager_with_redis = SecurityManager(secret_key="test", redis_url="redis://localhost")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._redis_patcher.stop()
+
     def setUp(self):
-        self.secret_key = "test_secret_key"
+        # Per-test manager for tests that mutate revocation state
         self.security_manager = SecurityManager(secret_key=self.secret_key, redis_url=None) # Initialize without Redis for most tests
 
     def test_generate_token(self):
-        user_id = "test_user"
-        token = self.security_manager.generate_token(user_id, expires_in=1) # Short expiry for testing
+        token = self.valid_token
         self.assertIsInstance(token, str)
 
         # Verify the token
-        decoded_payload = jwt.decode(token, self.secret_key, algorithms=['HS256'])
-        self.assertEqual(decoded_payload['user_id'], user_id)
+        decoded_payload = jwt.decode(token, self.secret_bytes, algorithms=['HS256'])
+        self.assertEqual(decoded_payload['user_id'], "test_user")
         self.assertIn('exp', decoded_payload)
 
     def test_verify_token_valid(self):
-        user_id = "test_user"
-        token = self.security_manager.generate_token(user_id)
-        payload = self.security_manager.verify_token(token)
-        self.assertEqual(payload['user_id'], user_id)
+        payload = self.shared_manager.verify_token(self.valid_token)
+        self.assertEqual(payload['user_id'], "test_user")
 
     def test_verify_token_expired(self):
         user_id = "test_user"
@@ -478,68 +599,120 @@ class TestSecurityManager(unittest.TestCase):
     def test_revoke_token(self):
         user_id = "test_user"
         token = self.security_manager.generate_token(user_id)
-        self.assertNotIn(token, self.security_manager.token_blacklist)
+        jti = jwt.decode(token, self.secret_bytes, algorithms=['HS256'])['jti']
+        self.assertFalse(self.security_manager._is_revoked(jti))
         self.security_manager.revoke_token(token)
-        self.assertIn(token, self.security_manager.token_blacklist)
-
-    @patch('security.redis.from_url')
-    def test_rate_limit_no_redis(self, mock_redis_from_url):
-        mock_redis_from_url.return_value = None
-        security_manager_no_redis = SecurityManager(secret_key="test", redis_url="redis://localhost")
-        self.assertFalse(security_manager_no_redis.rate_limit("key", 5, 60))
-        mock_redis_from_url.assert_called_once()
-
-    @patch('security.redis.from_url')
-    def test_rate_limit_within_limit(self, mock_redis_from_url):
-        mock_redis_client = MagicMock()
-        mock_redis_from_url.return_value = mock_redis_client
-        mock_redis_client.zcard.return_value = 3 # Current count is 3
-        
-        security_manager_with_redis = SecurityManager(secret_key="test", redis_url="redis://localhost")
-        self.assertFalse(security_manager_with_redis.rate_limit("key", 5, 60)) # Limit is 5
-
-        mock_redis_client.zremrangebyscore.assert_called_once()
-        mock_redis_client.zcard.assert_called_once()
-        mock_redis_client.zadd.assert_called_once()
-        mock_redis_client.expire.assert_called_once()
-
-    @patch('security.redis.from_url')
-    def test_rate_limit_exceeds_limit(self, mock_redis_from_url):
-        mock_redis_client = MagicMock()
-        mock_redis_from_url.return_value = mock_redis_client
-        mock_redis_client.zcard.return_value = 5 # Current count is 5
-        
-        security_manager_with_redis = SecurityManager(secret_key="test", redis_url="redis://localhost")
-        self.assertTrue(security_manager_with_redis.rate_limit("key", 5, 60)) # Limit is 5
-
-        mock_redis_client.zremrangebyscore.assert_called_once()
-        mock_redis_client.zcard.assert_called_once()
-        mock_redis_client.zadd.assert_not_called() # Should not add if limit is exceeded
-        mock_redis_client.expire.assert_not_called() # Should not expire if limit is exceeded
+        self.assertTrue(self.security_manager._is_revoked(jti))
+
+    def test_rate_limit_no_redis(self):
+        self._mock_from_url.return_value = None
+        try:
+            security_manager_no_redis = SecurityManager(secret_key="test", redis_url="redis://localhost")
+            self.assertFalse(security_manager_no_redis.rate_limit("key", 5, 60))
+        finally:
+            self._mock_from_url.return_value = self.mock_redis_client
+
+    def test_rate_limit_within_limit(self):
+        self.mock_redis_client.reset_mock()
+        pipe = self.mock_redis_client.pipeline.return_value
+        pipe.execute.return_value = [True, 3]  # SET primed the key; count after INCR is 3
+
+        self.assertFalse(self.security_manager_with_redis.rate_limit("key", 5, 60)) # Limit is 5
+        pipe.set.assert_called_once_with("key", 0, ex=60, nx=True)
+        pipe.incr.assert_called_once_with("key")
+
+    def test_rate_limit_exceeds_limit(self):
+        self.mock_redis_client.reset_mock()
+        pipe = self.mock_redis_client.pipeline.return_value
+        pipe.execute.return_value = [None, 6]  # Key already primed; count exceeds limit
+
+        self.assertTrue(self.security_manager_with_redis.rate_limit("key", 5, 60)) # Limit is 5
+
+    def test_rate_limit_strict_rolling(self):
+        script = self.security_manager_with_redis._rate_limit_script
+        script.reset_mock()
+        script.return_value = 0  # Lua script: 0 = allowed
+
+        self.assertFalse(self.security_manager_with_redis.rate_limit("key", 5, 60, strict_rolling=True))
+        script.assert_called_once()
+
+        script.return_value = 1  # 1 = limited
+        self.assertTrue(self.security_manager_with_redis.rate_limit("key", 5, 60, strict_rolling=True))
+
+
+def test_valid_md_fixture_roundtrip(valid_md):
+    """pytest-style check of the shared fixtures in conftest.
+
+    The session-scoped valid_md file and the mmap reader back pytest-style
+    tests; parse the fixture end to end so both stay exercised.
+    """
+    from conftest import read_fixture_mmap
+
+    content = read_fixture_mmap(valid_md)
+    frontmatter, body = ContentManager().parse_frontmatter(content)
+    assert frontmatter['title'] == 'Test Title'
+    assert frontmatter['language'] == 'en'
+    assert '# This is a test article' in body
+
+
+class TestImportLayout(unittest.TestCase):
+    def test_server_module_imports(self):
+        # Regression test for the flat intra-repo imports that made
+        # ``python mcp_publish_server.py`` die with ModuleNotFoundError
+        # before any tool could run.
+        import importlib
+
+        importlib.import_module("publishers")
+        importlib.import_module("mcp_publish_server")
 
 
 class TestMCPPublishServer(unittest.TestCase):
-    # Keep existing tests for make_api_request for now
-    @patch('requests.post')
-    def test_make_api_request(self, mock_post):
-        # Test successful request
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_post.return_value = mock_response
-
-        response = make_api_request("http://test.com", {}, {})
+    # make_api_request moved from a requests-based module helper to an
+    # httpx-based coroutine on MediumPublisher; test it there.
+    @classmethod
+    def setUpClass(cls):
+        # Deferred: the publisher module pulls in httpx and the other
+        # publisher machinery, which the rest of this file never needs.
+        from publishers import medium_publisher
+        cls.medium_publisher = medium_publisher
+
+    def _request(self, handler):
+        """Run one make_api_request round against an httpx.MockTransport."""
+        import httpx
+
+        async def run():
+            publisher = self.medium_publisher.MediumPublisher(
+                api_key="test-key", api_url="http://test.com"
+            )
+            # Swap the real client for one stubbed at the transport layer
+            await publisher._client.aclose()
+            publisher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                # retries=1 so the failure cases fail fast instead of
+                # sleeping through the backoff schedule
+                return await publisher.make_api_request("http://test.com", {}, retries=1)
+            finally:
+                await publisher.aclose()
+
+        return asyncio.run(run())
+
+    def test_make_api_request(self):
+        import httpx
+
+        # Successful request
+        response = self._request(lambda request: httpx.Response(200, json={"ok": True}))
         self.assertEqual(response.status_code, 200)
 
-        # Test rate limit handling
-        mock_response.status_code = 429
-        mock_post.return_value = mock_response
-        with self.assertRaises(PublishingError):
-            make_api_request("http://test.com", {}, {})
+        # Rate limit exhausts the retry budget and surfaces as PublishingError
+        with self.assertRaises(self.medium_publisher.PublishingError):
+            self._request(lambda request: httpx.Response(429))
+
+        # Transport-level failure
+        def raise_error(request):
+            raise httpx.ConnectError("Test error", request=request)
 
-        # Test request failure
-        mock_post.side_effect = requests.exceptions.RequestException("Test error")
-        with self.assertRaises(PublishingError):
-            make_api_request("http://test.com", {}, {})
+        with self.assertRaises(self.medium_publisher.PublishingError):
+            self._request(raise_error)
 
 
 if __name__ == '__main__':
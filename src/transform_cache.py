@@ -0,0 +1,53 @@
+import logging
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Default location for the persisted transform results
+_DEFAULT_CACHE_DIR = Path.home() / ".cache" / "mcp-publishflow" / "transforms"
+
+
+class TransformCache:
+    """Content-hash keyed cache for expensive content transforms.
+
+    Publishing the same post to several networks re-runs the same
+    normalization on identical input. Keying by a hash of the source makes
+    the second-through-Nth transform a dict lookup, and persisting results
+    to disk carries the cache across server restarts. Disk I/O is
+    best-effort: a failed read or write degrades to recomputing.
+    """
+
+    def __init__(self, cache_dir: Path = None, maxsize: int = 64):
+        self._mem: dict = {}
+        self._maxsize = maxsize
+        self._cache_dir = Path(cache_dir) if cache_dir else _DEFAULT_CACHE_DIR
+
+    def get_or_compute(self, content_hash: str, transform_fn: Callable[[], str]) -> str:
+        """Return the cached transform for content_hash, computing on miss."""
+        cached = self._mem.get(content_hash)
+        if cached is not None:
+            return cached
+
+        disk_path = self._cache_dir / f"{content_hash}.md"
+        try:
+            result = disk_path.read_text(encoding="utf-8")
+            self._store_mem(content_hash, result)
+            return result
+        except OSError:
+            pass
+
+        result = transform_fn()
+        self._store_mem(content_hash, result)
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            disk_path.write_text(result, encoding="utf-8")
+        except OSError as e:
+            logger.debug("Could not persist transform cache entry: %s", e)
+        return result
+
+    def _store_mem(self, content_hash: str, result: str) -> None:
+        """Insert with FIFO eviction to bound memory."""
+        if len(self._mem) >= self._maxsize:
+            self._mem.pop(next(iter(self._mem)))
+        self._mem[content_hash] = result